@@ -1,5 +1,19 @@
+import os
+import json
+import time
+import pickle
+import sqlite3
+import struct
+import hashlib
+import importlib.metadata
+import threading
+from functools import cache
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, wait
+import zstandard as zstd
 import streamlit as st
 import plotly.express as px
+import numpy as np
 import pandas as pd
 from statsbombpy import sb
 from mplsoccer import Pitch
@@ -27,8 +41,14 @@ state = {
     "season_id": None,
     "match_id": None,
     "data": None,
+    "events_load": None,
+    "prefetch": None,
     "current_view": 0,
     "current_explore_view": "Análise da Partida",
+    "player_id": None,
+    "search_query": None,
+    "search_page": 0,
+    "search_cursors": [0],
 }
 
 
@@ -53,13 +73,501 @@ def get_state(key):
 
 
 def get_available_views():
-    return ["🔍 Explorar", "✨ Sobre"]
+    return ["🔍 Explorar", "📊 Comparar", "👤 Jogadores", "🔎 Buscar", "✨ Sobre"]
 
 
 def get_current_view():
     return get_state("current_view") or get_available_views()[0]
 
 
+# --------------------------
+# CACHE STORAGE FUNCTIONS
+# --------------------------
+
+
+def get_cache_dir(*parts, create=True):
+    # The cache location can be changed, e.g. to run the load test with a cold cache
+    root = os.environ.get("STATSBOMB_CACHE_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".cache"
+    )
+    path = os.path.join(root, *parts)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return path
+
+
+@cache
+def get_cache_version():
+    # Bump the format when the stored data changes, a new statsbombpy may change
+    # the events schema, so every entry written by another version is refetched.
+    # Read once, the installed version does not change while the app runs
+    return f"1-statsbombpy-{importlib.metadata.version('statsbombpy')}"
+
+
+def get_temp_path(path):
+    # Unique per writer, so concurrent writes never share a temp file
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def write_json(path, data):
+    tmp_path = get_temp_path(path)
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def write_cache_blob(path, data, level=10):
+    # Blob layout: magic, header size, JSON header and the zstd payload
+    payload = zstd.ZstdCompressor(level=level).compress(
+        pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    )
+    header = json.dumps(
+        {
+            "version": get_cache_version(),
+            "created": time.time(),
+            "size": len(payload),
+            "checksum": hashlib.blake2b(payload).hexdigest(),
+        }
+    ).encode()
+
+    # Written to a temp file first, a killed worker never leaves a partial blob
+    tmp_path = get_temp_path(path)
+    with open(tmp_path, "wb") as f:
+        f.write(b"SBZ1" + struct.pack("<I", len(header)) + header + payload)
+    os.replace(tmp_path, path)
+
+
+def read_cache_blob(path, max_age=None):
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+        if content[:4] != b"SBZ1":
+            raise ValueError("Invalid magic")
+        (header_size,) = struct.unpack("<I", content[4:8])
+        header = json.loads(content[8 : 8 + header_size])
+        payload = content[8 + header_size :]
+
+        # Stale entries are refetched, like the corrupt ones
+        if header["version"] != get_cache_version():
+            raise ValueError("Version mismatch")
+        if max_age is not None and time.time() - header["created"] > max_age:
+            raise ValueError("Expired")
+        if (
+            len(payload) != header["size"]
+            or hashlib.blake2b(payload).hexdigest() != header["checksum"]
+        ):
+            raise ValueError("Checksum mismatch")
+
+        return pickle.loads(zstd.ZstdDecompressor().decompress(payload))
+    except Exception:
+        # [!] Another worker may have replaced the file in the meantime
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+# --------------------------
+# EVENTS STORE FUNCTIONS
+# --------------------------
+
+
+def get_view_event_columns(view=""):
+    # Columns read by the cached engines (summaries, heatmaps, spatial index,
+    # possession chains and pass networks), they share a single cached frame
+    engine_columns = (
+        "index",
+        "minute",
+        "second",
+        "type",
+        "team",
+        "player",
+        "location",
+        "pass_end_location",
+        "pass_recipient",
+        "pass_outcome",
+        "pass_type",
+        "carry_end_location",
+        "shot_end_location",
+        "shot_outcome",
+        "foul_committed_card",
+        "bad_behavior_card",
+        "possession",
+        "possession_team",
+        "shot_statsbomb_xg",
+    )
+
+    # Columns each view needs, the remaining ones are loaded on demand
+    view_columns = {
+        # Filters, metrics, maps, charts and the filtered table
+        "Análise da Partida": (
+            "id",
+            "period",
+            "timestamp",
+            "minute",
+            "second",
+            "type",
+            "team",
+            "player",
+            "location",
+            "pass_end_location",
+            "pass_recipient",
+            "pass_outcome",
+            "shot_end_location",
+            "shot_outcome",
+        ),
+        # Default columns of the table, the user can add any other one
+        "Explorar DataFrame": (
+            "id",
+            "index",
+            "period",
+            "timestamp",
+            "minute",
+            "second",
+            "type",
+            "possession_team",
+            "team",
+            "player",
+            "location",
+        ),
+        # Metrics and charts by player, the heatmaps come from the engines
+        "Comparar Partidas": (
+            "minute",
+            "type",
+            "team",
+            "player",
+            "location",
+            "shot_outcome",
+        ),
+        # The frame held by the engines, the toggle profiles every column
+        "Perfil de Memória": engine_columns,
+    }
+    return view_columns.get(view, engine_columns)
+
+
+def get_match_events_manifest_path(match_id, create=True):
+    store_dir = get_cache_dir("events", str(match_id), create=create)
+    return os.path.join(store_dir, "columns.json")
+
+
+def read_match_events_manifest(match_id):
+    manifest_path = get_match_events_manifest_path(match_id, create=False)
+    if not os.path.exists(manifest_path):
+        return None
+
+    # Stores written by another cache version are fetched again
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest["version"] == get_cache_version():
+            return manifest["columns"]
+    except Exception:
+        pass
+    return None
+
+
+def is_match_events_stored(match_id):
+    return read_match_events_manifest(match_id) is not None
+
+
+def invalidate_match_events(match_id):
+    try:
+        os.remove(get_match_events_manifest_path(match_id, create=False))
+    except OSError:
+        pass
+
+
+def store_match_events(match_id, cancel_event=None):
+    columns = read_match_events_manifest(match_id)
+    if columns is not None:
+        return columns
+
+    # The load was abandoned before it started
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+
+    # Each column is stored in its own blob, so we can load only what we need
+    store_dir = get_cache_dir("events", str(match_id))
+    events = sb.events(match_id=match_id)
+    for column in events.columns:
+        write_cache_blob(os.path.join(store_dir, f"{column}.zst"), events[column])
+    store_match_summary(match_id, events)
+    store_match_players(match_id, events)
+
+    # [!] The manifest is written last, so a partial store is fetched again
+    columns = events.columns.tolist()
+    write_json(
+        get_match_events_manifest_path(match_id),
+        {"version": get_cache_version(), "columns": columns},
+    )
+
+    # [!] The match is stored even if it can not be indexed, it is indexed
+    # again when its season is listed
+    try:
+        index_match(match_id)
+    except Exception as e:
+        print(f"Failed to index match {match_id}: {e}")
+    return columns
+
+
+def store_matches_events(match_ids):
+    # Fetch the matches in parallel, statsbombpy requests are I/O bound
+    executor = get_bulk_loader_executor()
+    futures = [
+        executor.submit(store_match_events, match_id) for match_id in set(match_ids)
+    ]
+    return [future.result() for future in futures]
+
+
+def load_stored_match_events(match_id, columns, retry=True):
+    store_dir = get_cache_dir("events", str(match_id))
+    data = {}
+    for column in columns:
+        data[column] = read_cache_blob(os.path.join(store_dir, f"{column}.zst"))
+
+        # Missing or corrupt column, fetch the match again
+        if data[column] is None:
+            if not retry:
+                raise ValueError(f"Invalid events store for match {match_id}")
+            invalidate_match_events(match_id)
+            store_match_events(match_id)
+            return load_stored_match_events(match_id, columns, retry=False)
+    return pd.DataFrame(data)
+
+
+# --------------------------
+# BACKGROUND LOADING FUNCTIONS
+# --------------------------
+
+
+@st.cache_resource
+def get_loader_executor():
+    # Shared by every session, so the number of concurrent fetches is bounded
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="events-loader")
+
+
+@st.cache_resource
+def get_bulk_loader_executor():
+    # Shared by every session too, separate from the loader, so loading a whole
+    # season never delays the match selected by another user
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="events-bulk-loader")
+
+
+def start_match_events_load(match_id):
+    load = get_state("events_load")
+    if load and load["match_id"] == match_id and not is_match_events_load_failed(load):
+        return load
+
+    # The user switched match mid-load, or the last load failed and is retried
+    cancel_match_events_load()
+
+    # The match is already being prefetched, wait for it instead of fetching twice
+    prefetch = get_state("prefetch")
+    if prefetch and match_id in prefetch["loads"]:
+        future, cancel_event = prefetch["loads"][match_id]
+        if future.running():
+            load = {
+                "match_id": match_id,
+                "future": future,
+                "cancel_event": cancel_event,
+                "prefetch": True,
+            }
+            set_state("events_load", load)
+            return load
+
+        # Still queued behind other prefetches, the loader picks it up sooner
+        future.cancel()
+
+    cancel_event = threading.Event()
+    future = get_loader_executor().submit(store_match_events, match_id, cancel_event)
+    load = {"match_id": match_id, "future": future, "cancel_event": cancel_event}
+    set_state("events_load", load)
+    return load
+
+
+def is_match_events_load_failed(load):
+    future = load["future"]
+    if not future.done():
+        return False
+    return future.cancelled() or future.exception() or future.result() is None
+
+
+def cancel_match_events_load():
+    load = get_state("events_load")
+    # A reused prefetch keeps running, it still warms the cache
+    if load and not load["future"].done() and not load.get("prefetch"):
+        # Pending loads are dropped, running ones stop before fetching
+        load["cancel_event"].set()
+        load["future"].cancel()
+    set_state("events_load", None)
+
+
+def wait_match_events_load(match_id, placeholder=None):
+    load = start_match_events_load(match_id)
+    started = time.time()
+
+    # Poll the load, so Streamlit can stop this run if the user switches match
+    while not wait([load["future"]], timeout=0.25).done:
+        if placeholder is not None:
+            placeholder.caption(
+                f"⏳ Carregando eventos da partida... {time.time() - started:.0f}s"
+            )
+    if placeholder is not None:
+        placeholder.empty()
+    return load["future"].result()
+
+
+# --------------------------
+# PREFETCH FUNCTIONS
+# --------------------------
+
+
+def get_prefetch_cfg():
+    return {
+        "max_workers": 2,
+        "neighbours": 2,
+        "team_fixtures": 2,
+        "budget_mb": 64,
+        # Estimated store size of a match, for the prefetches not finished yet
+        "match_size_mb": 2,
+    }
+
+
+@st.cache_resource
+def get_prefetch_executor():
+    # Separate from the loader, so prefetches never delay the selected match
+    return ThreadPoolExecutor(
+        max_workers=get_prefetch_cfg()["max_workers"],
+        thread_name_prefix="events-prefetch",
+    )
+
+
+@st.cache_resource
+def get_prefetch_stats():
+    # Shared by every session, to tune the policy from the overall hit rate
+    return {
+        "lock": threading.Lock(),
+        "switches": 0,
+        "warm": 0,
+        "prefetch_hits": 0,
+        "prefetched": set(),
+    }
+
+
+def get_match_events_store_size(match_id):
+    store_dir = get_cache_dir("events", str(match_id), create=False)
+    if not os.path.exists(store_dir):
+        return 0
+    return sum(
+        os.path.getsize(os.path.join(store_dir, name)) for name in os.listdir(store_dir)
+    )
+
+
+def get_prefetch_candidates(matches, match_id):
+    cfg = get_prefetch_cfg()
+
+    # Neighbours in the matches selector, the next ones first
+    match_ids = [int(match_id) for match_id in matches["match_id"].unique()]
+    position = match_ids.index(match_id)
+    candidates = []
+    for offset in range(1, cfg["neighbours"] + 1):
+        candidates += match_ids[position + offset : position + offset + 1]
+        candidates += match_ids[max(position - offset, 0) : position - offset + 1]
+
+    # Next fixtures of the same teams
+    match = matches[matches["match_id"] == match_id]
+    for team in [match["home_team"].values[0], match["away_team"].values[0]]:
+        fixtures = matches[
+            ((matches["home_team"] == team) | (matches["away_team"] == team))
+            & (matches["match_date"] > match["match_date"].values[0])
+        ].sort_values("match_date")
+        candidates += [int(fixture_id) for fixture_id in fixtures["match_id"]][
+            : cfg["team_fixtures"]
+        ]
+
+    # Unique candidates, in order, that are not stored yet
+    return [
+        candidate
+        for candidate in dict.fromkeys(candidates)
+        if candidate != match_id and not is_match_events_stored(candidate)
+    ]
+
+
+def cancel_prefetch():
+    prefetch = get_state("prefetch")
+    if prefetch:
+        for future, cancel_event in prefetch["loads"].values():
+            if not future.done():
+                cancel_event.set()
+                future.cancel()
+    set_state("prefetch", None)
+
+
+def prefetch_matches(competition_id, season_id, match_id):
+    # The user left the season, drop the pending prefetches
+    prefetch = get_state("prefetch")
+    if prefetch and prefetch["season"] != (competition_id, season_id):
+        cancel_prefetch()
+        prefetch = None
+    if not prefetch:
+        prefetch = {"season": (competition_id, season_id), "loads": {}}
+        set_state("prefetch", prefetch)
+
+    # Stop once the prefetched matches reach the budget, the queued and running
+    # ones count with an estimated size
+    cfg = get_prefetch_cfg()
+    budget = cfg["budget_mb"] * 1024 * 1024
+    match_size = cfg["match_size_mb"] * 1024 * 1024
+    used = 0
+    for prefetch_id, (future, _) in prefetch["loads"].items():
+        if future.cancelled():
+            continue
+        if future.done():
+            used += get_match_events_store_size(prefetch_id)
+        else:
+            used += match_size
+
+    matches = get_competition_matches(competition_id, season_id)
+    stats = get_prefetch_stats()
+    for candidate in get_prefetch_candidates(matches, match_id):
+        if used >= budget:
+            break
+        if candidate in prefetch["loads"]:
+            continue
+        cancel_event = threading.Event()
+        future = get_prefetch_executor().submit(
+            store_match_events, candidate, cancel_event
+        )
+        prefetch["loads"][candidate] = (future, cancel_event)
+        used += match_size
+        with stats["lock"]:
+            stats["prefetched"].add(candidate)
+
+
+def record_match_switch(match_id):
+    stats = get_prefetch_stats()
+    with stats["lock"]:
+        stats["switches"] += 1
+        if is_match_events_stored(match_id):
+            stats["warm"] += 1
+            if match_id in stats["prefetched"]:
+                stats["prefetch_hits"] += 1
+
+
+def get_prefetch_hit_rate_text():
+    stats = get_prefetch_stats()
+    if not stats["switches"]:
+        return None
+    return (
+        f"⚡ Cache aquecido em {stats['warm'] / stats['switches']:.0%} das trocas de "
+        f"partida ({stats['prefetch_hits']} de {stats['switches']} via prefetch)"
+    )
+
+
 # --------------------------
 # STATSBOMB DATA FUNCTIONS
 # --------------------------
@@ -67,17 +575,90 @@ def get_current_view():
 
 @st.cache_data(ttl=3600)
 def get_competitions():
-    return sb.competitions()
+    competitions_path = os.path.join(get_cache_dir(), "competitions.zst")
+    competitions = read_cache_blob(competitions_path, max_age=86400)
+    if competitions is None:
+        competitions = sb.competitions()
+        write_cache_blob(competitions_path, competitions)
+    return competitions
+
+
+def get_competitions_index_levels():
+    # (id column, name column) of each selector, from the top to the bottom
+    return [
+        ("country_name", "country_name"),
+        ("competition_id", "competition_name"),
+        ("season_id", "season_name"),
+    ]
+
+
+def build_selector_index(df, levels):
+    def new_node():
+        return {"options": [], "ids": {}, "positions": {}, "children": {}}
+
+    # Build the tree in a single pass over the rows
+    root = new_node()
+    columns = [column for level in levels for column in level]
+    for row in df[columns].itertuples(index=False):
+        node = root
+        for depth in range(len(levels)):
+            key, name = row[depth * 2], row[depth * 2 + 1]
+            key = int(key) if isinstance(key, (int, np.integer)) else key
+            if key not in node["children"]:
+                node["positions"][key] = len(node["options"])
+                node["options"].append(name)
+                node["ids"].setdefault(name, key)
+                node["children"][key] = new_node()
+            node = node["children"][key]
+    return root
+
+
+@st.cache_data(ttl=3600)
+def get_competitions_index():
+    return build_selector_index(get_competitions(), get_competitions_index_levels())
 
 
 @st.cache_data(ttl=3600)
 def get_competition_matches(competition_id, season_id):
-    return sb.matches(competition_id=competition_id, season_id=season_id)
+    matches_path = os.path.join(
+        get_cache_dir("matches"), f"{competition_id}_{season_id}.zst"
+    )
+    matches = read_cache_blob(matches_path, max_age=86400)
+    if matches is None:
+        matches = sb.matches(competition_id=competition_id, season_id=season_id)
+        write_cache_blob(matches_path, matches)
+    update_matches_catalog(competition_id, season_id, matches)
+    return matches
 
 
 @st.cache_data(ttl=3600)
-def get_match_events(match_id):
-    return sb.events(match_id=match_id)
+def get_match_event_columns(match_id):
+    return store_match_events(match_id)
+
+
+@st.cache_data(ttl=3600)
+def get_match_events(match_id, columns=None):
+    stored_columns = get_match_event_columns(match_id)
+    if columns is None:
+        columns = stored_columns
+
+    # Some columns are only present when the event happened (e.g. cards)
+    columns = [column for column in columns if column in stored_columns]
+    return load_stored_match_events(match_id, columns)
+
+
+@st.cache_data(ttl=3600)
+def get_multi_match_events(match_ids, columns=None):
+    # Make sure every match is stored before reading them
+    store_matches_events(match_ids)
+
+    # Combine the matches in a single DataFrame, keyed by match_id
+    frames = []
+    for match_id in match_ids:
+        events = get_match_events(match_id, columns)
+        events.insert(0, "match_id", np.full(len(events), match_id, dtype=np.int32))
+        frames.append(events)
+    return pd.concat(frames, ignore_index=True)
 
 
 @st.cache_data(ttl=3600)
@@ -91,61 +672,23 @@ def get_teams(competition_id, season_id, match_id):
 
 @st.cache_data(ttl=3600)
 def generate_match_score_dict(competition_id, season_id, match_id):
-
-    # Get goals for open play and penalties
-    goals = get_goals_df(match_id)
+    # The score comes from the match summary, no need to load the events
+    summary = get_match_summary(match_id)
     teams = get_teams(competition_id, season_id, match_id)
 
-    # Penalty goals are counted after the minute 120
-    penalty_goals = goals[goals["minute"] >= 120]
-    open_play_goals = goals[goals["minute"] < 120]
-
-    # Get player name and time for each goal
-    home_team_player_goals = goals[goals["team"] == teams[0]][["player", "minute"]]
-    alway_team_player_goals = goals[goals["team"] == teams[1]][["player", "minute"]]
-
-    home_team_player_goals_text = ""
-    for i, row in home_team_player_goals.iterrows():
-        home_team_player_goals_text += f"{row['player']} ({row['minute']}'), "
-    home_team_player_goals_text = home_team_player_goals_text[:-2]
-
-    alway_team_player_goals_text = ""
-    for i, row in alway_team_player_goals.iterrows():
-        alway_team_player_goals_text += f"{row['player']} ({row['minute']}'), "
-    alway_team_player_goals_text = alway_team_player_goals_text[:-2]
-
-    # Get total goals for each team
-    open_play_goals = open_play_goals.groupby("team").size()
-    penalty_goals = penalty_goals.groupby("team").size()
-
-    home_team_open_play_goals = (
-        open_play_goals[teams[0]] if teams[0] in open_play_goals else 0
-    )
-    home_team_penalty_goals = (
-        penalty_goals[teams[0]] if teams[0] in penalty_goals else 0
-    )
-
-    # [!] Second team may not be present in the goals DataFrame
-    if len(teams) == 2:
-        alway_team_open_play_goals = (
-            open_play_goals[teams[1]] if teams[1] in open_play_goals else 0
-        )
-        alway_team_penalty_goals = (
-            penalty_goals[teams[1]] if teams[1] in penalty_goals else 0
-        )
-    else:
-        alway_team_open_play_goals = 0
-        alway_team_penalty_goals = 0
+    # [!] Second team may not be present in the summary if it has no events
+    home_team_summary = summary.get(teams[0], get_empty_team_summary())
+    alway_team_summary = summary.get(teams[1], get_empty_team_summary())
 
     return {
         "home_team_name": teams[0],
-        "home_team_open_play": home_team_open_play_goals,
-        "home_team_penalty": home_team_penalty_goals,
-        "home_team_player_goals": home_team_player_goals_text,
+        "home_team_open_play": home_team_summary["open_play"],
+        "home_team_penalty": home_team_summary["penalty"],
+        "home_team_player_goals": home_team_summary["player_goals"],
         "alway_team_name": teams[1],
-        "alway_team_open_play": alway_team_open_play_goals,
-        "alway_team_penalty": alway_team_penalty_goals,
-        "alway_team_player_goals": alway_team_player_goals_text,
+        "alway_team_open_play": alway_team_summary["open_play"],
+        "alway_team_penalty": alway_team_summary["penalty"],
+        "alway_team_player_goals": alway_team_summary["player_goals"],
     }
 
 
@@ -153,20 +696,6 @@ def get_match_duration(match_events_df):
     return match_events_df["minute"].max()
 
 
-@st.cache_data(ttl=3600)
-def get_goals_df(match_id, team="", shot_type=""):
-    events = get_match_events(match_id)
-    goals = events[events["type"] == "Shot"]
-    goals = goals[goals["shot_outcome"] == "Goal"]
-
-    if shot_type:
-        goals = goals[goals["shot_type"] == shot_type]
-
-    if team:
-        goals = goals[goals["team"] == team]
-    return goals
-
-
 @st.cache_data(ttl=3600)
 def get_shots_on_goal_df(match_events_df, team=""):
     shots_on_goal = match_events_df[
@@ -179,25 +708,29 @@ def get_shots_on_goal_df(match_events_df, team=""):
 
 
 @st.cache_data(ttl=3600)
-def get_match_events_count_dict(match_events_df, stats_map=None):
+def get_default_stats_map():
+    return {
+        "⚽ Total de Chutes": "Shot",
+        "🅿️ Total de Passes": "Pass",
+        "❌ Faltas": {"type": "Foul Committed"},
+        "🏳️ Escanteios": {"pass_type": "Corner"},
+        "🟨 Cartões Amarelos": {
+            "foul_committed_card": "Yellow Card",
+            "bad_behavior_card": "Yellow Card",
+        },
+        "🟥 Cartões Vermelhos": {
+            "foul_committed_card": "Red Card",
+            "bad_behavior_card": "Red Card",
+        },
+    }
+
+
+def count_match_events(match_events_df, stats_map=None):
     events = match_events_df
 
     # Define the default stats map
     if stats_map is None:
-        stats_map = {
-            "⚽ Total de Chutes": "Shot",
-            "🅿️ Total de Passes": "Pass",
-            "❌ Faltas": {"type": "Foul Committed"},
-            "🏳️ Escanteios": {"pass_type": "Corner"},
-            "🟨 Cartões Amarelos": {
-                "foul_committed_card": "Yellow Card",
-                "bad_behavior_card": "Yellow Card",
-            },
-            "🟥 Cartões Vermelhos": {
-                "foul_committed_card": "Red Card",
-                "bad_behavior_card": "Red Card",
-            },
-        }
+        stats_map = get_default_stats_map()
 
     # Get stats for each team
     teams = events["team"].unique()
@@ -274,83 +807,1210 @@ def get_metrics_percentage_comparison(match_events_df, match_events_df2):
 
 
 # --------------------------
-# STATSBOMB DATA SELECTORS
+# MATCH SUMMARY FUNCTIONS
 # --------------------------
 
 
-def competitions_selector():
-    # Get competitions DataFrame
+def get_empty_team_summary():
+    return {
+        "open_play": 0,
+        "penalty": 0,
+        "player_goals": "",
+        "stats": dict.fromkeys(get_default_stats_map(), 0),
+    }
+
+
+def build_match_summary(events):
+    goals = events[(events["type"] == "Shot") & (events["shot_outcome"] == "Goal")]
+    stats = count_match_events(events)
+
+    summary = {}
+    for team in events["team"].dropna().unique():
+        team_goals = goals[goals["team"] == team]
+        summary[team] = {
+            # Penalty goals are counted after the minute 120
+            "open_play": int((team_goals["minute"] < 120).sum()),
+            "penalty": int((team_goals["minute"] >= 120).sum()),
+            # Get player name and time for each goal
+            "player_goals": ", ".join(
+                f"{player} ({minute}')"
+                for player, minute in zip(team_goals["player"], team_goals["minute"])
+            ),
+            "stats": {name: int(value) for name, value in stats[team].items()},
+        }
+    return summary
+
+
+def store_match_summary(match_id, events):
+    summary_path = os.path.join(get_cache_dir("events", str(match_id)), "summary.json")
+    write_json(summary_path, build_match_summary(events))
+
+
+def get_match_summary(match_id):
+    summary_path = os.path.join(get_cache_dir("events", str(match_id)), "summary.json")
+
+    # Matches stored before the summaries existed
+    if not os.path.exists(summary_path):
+        store_match_summary(
+            match_id, get_match_events(match_id, get_view_event_columns())
+        )
+
+    with open(summary_path) as f:
+        return json.load(f)
+
+
+def get_season_summary(competition_id, season_id):
+    summary_path = os.path.join(
+        get_cache_dir("summaries"), f"{competition_id}_{season_id}.json"
+    )
+    season_summary = {}
+    if os.path.exists(summary_path):
+        with open(summary_path) as f:
+            season_summary = json.load(f)
+
+    # Add the matches stored since the last update
+    matches = get_competition_matches(competition_id, season_id)
+    updated = False
+    for match_id in matches["match_id"]:
+        key = str(int(match_id))
+        if key not in season_summary and is_match_events_stored(match_id):
+            season_summary[key] = get_match_summary(int(match_id))
+            updated = True
+
+    if updated:
+        write_json(summary_path, season_summary)
+    return season_summary
+
+
+def get_season_results_df(competition_id, season_id):
+    # Rebuilt only when a match of the season is stored, the manifests are
+    # written last, so their modification times are enough for the cache key
+    matches = get_competition_matches(competition_id, season_id)
+    stored_matches = []
+    for match_id in matches["match_id"]:
+        manifest_path = get_match_events_manifest_path(match_id, create=False)
+        try:
+            stored_matches.append((int(match_id), os.stat(manifest_path).st_mtime_ns))
+        except OSError:
+            # Not stored yet
+            pass
+    return build_season_results_df(competition_id, season_id, tuple(stored_matches))
+
+
+@st.cache_data(ttl=3600)
+def build_season_results_df(competition_id, season_id, stored_matches):
+    matches = get_competition_matches(competition_id, season_id)
+    matches = matches.sort_values("match_date")
+    season_summary = get_season_summary(competition_id, season_id)
+
+    def versus(home_value, alway_value):
+        return f"{home_value} x {alway_value}"
+
+    rows = []
+    for match in matches.itertuples(index=False):
+        row = {
+            "Data": match.match_date,
+            "Mandante": match.home_team,
+            "Placar": versus(match.home_score, match.away_score),
+            "Visitante": match.away_team,
+        }
+
+        # Details are only available for the matches already loaded
+        summary = season_summary.get(str(int(match.match_id)))
+        if summary:
+            home = summary.get(match.home_team, get_empty_team_summary())
+            alway = summary.get(match.away_team, get_empty_team_summary())
+            if home["penalty"] or alway["penalty"]:
+                row["Pênaltis"] = versus(home["penalty"], alway["penalty"])
+            player_goals = [home["player_goals"], alway["player_goals"]]
+            row["Gols"] = ", ".join(goals for goals in player_goals if goals)
+            for stat_name in home["stats"]:
+                row[stat_name] = versus(
+                    home["stats"][stat_name], alway["stats"][stat_name]
+                )
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+# --------------------------
+# PLAYER INDEX FUNCTIONS
+# --------------------------
+
+
+def parse_lineup_time(value):
+    # Lineup times are "MM:SS", minutes can go over 60
+    minutes, seconds = value.split(":")
+    return int(minutes) + int(seconds) / 60
+
+
+def build_match_players(events, lineups):
+    match_end = ((events["minute"] * 60 + events["second"]).max()) / 60
+
+    # Minutes played, from the positions of each player in the lineups
+    players = {}
+    for team, lineup in lineups.items():
+        for player in lineup.itertuples(index=False):
+            if not player.positions:
+                continue
+            minutes = sum(
+                (parse_lineup_time(position["to"]) if position["to"] else match_end)
+                - parse_lineup_time(position["from"])
+                for position in player.positions
+            )
+            players[str(int(player.player_id))] = {
+                "name": player.player_name,
+                "team": team,
+                "minutes": round(minutes),
+                "events": {},
+            }
+
+    # Events by type for each player
+    player_events = events[events["player_id"].notna()]
+    counts = player_events.groupby(["player_id", "player", "team", "type"]).size()
+    for (player_id, name, team, event_type), count in counts.items():
+        player = players.setdefault(
+            str(int(player_id)),
+            {"name": name, "team": team, "minutes": None, "events": {}},
+        )
+        player["events"][event_type] = int(count)
+    return players
+
+
+def store_match_players(match_id, events):
+    # Lineups are optional, players still get their events without them
+    try:
+        lineups = sb.lineups(match_id=match_id)
+    except Exception:
+        lineups = {}
+
+    players_path = os.path.join(get_cache_dir("events", str(match_id)), "players.json")
+    write_json(players_path, build_match_players(events, lineups))
+
+
+def get_match_players(match_id):
+    players_path = os.path.join(get_cache_dir("events", str(match_id)), "players.json")
+
+    # Matches stored before the players existed
+    if not os.path.exists(players_path):
+        store_match_players(match_id, get_match_events(match_id))
+
+    with open(players_path) as f:
+        return json.load(f)
+
+
+def build_player_rows(match_id, players):
+    return [
+        (
+            int(player_id),
+            int(match_id),
+            player["team"],
+            player["minutes"],
+            json.dumps(player["events"]),
+        )
+        for player_id, player in players.items()
+    ]
+
+
+def get_players_directory():
+    with closing(get_index_connection()) as connection:
+        return dict(connection.execute("SELECT player_id, name FROM players"))
+
+
+def get_player_matches_df(player_id):
+    with closing(get_index_connection()) as connection:
+        appearances = connection.execute(
+            """
+            SELECT
+                p.match_id, m.competition_id, m.season_id, m.match_date,
+                m.competition, m.season, m.home_team, m.away_team, p.team,
+                p.minutes, p.events
+            FROM player_matches p
+            JOIN matches m USING (match_id)
+            WHERE p.player_id = ?
+            """,
+            (int(player_id),),
+        ).fetchall()
+
+    rows = []
+    for appearance in appearances:
+        (
+            match_id,
+            competition_id,
+            season_id,
+            match_date,
+            competition,
+            season,
+            home_team,
+            away_team,
+            team,
+            minutes,
+            events,
+        ) = appearance
+        rows.append(
+            {
+                "match_id": match_id,
+                "competition_id": competition_id,
+                "season_id": season_id,
+                "Data": match_date,
+                "Competição": competition,
+                "Temporada": season,
+                "Partida": f"{home_team} x {away_team}",
+                "Time": team,
+                "Minutos": minutes,
+                **json.loads(events),
+            }
+        )
+    return pd.DataFrame(rows).sort_values("Data").fillna(0)
+
+
+# --------------------------
+# SEARCH INDEX FUNCTIONS
+# --------------------------
+
+
+def get_search_attribute_columns():
+    # Columns searched as outcome and attributes of each event
+    return {
+        "outcome": [
+            "pass_outcome",
+            "shot_outcome",
+            "goalkeeper_outcome",
+            "dribble_outcome",
+            "duel_outcome",
+            "interception_outcome",
+        ],
+        "attributes": [
+            "play_pattern",
+            "position",
+            "pass_type",
+            "pass_height",
+            "pass_body_part",
+            "pass_technique",
+            "shot_type",
+            "shot_body_part",
+            "shot_technique",
+            "goalkeeper_type",
+            "goalkeeper_technique",
+            "duel_type",
+            "foul_committed_card",
+            "bad_behavior_card",
+        ],
+    }
+
+
+def get_index_connection():
+    connection = sqlite3.connect(
+        os.path.join(get_cache_dir(), "index.sqlite3"), timeout=30
+    )
+    connection.execute("PRAGMA journal_mode=WAL")
+
+    # Indexes built with an older schema are rebuilt from the events store
+    schema_version = 2
+    if connection.execute("PRAGMA user_version").fetchone()[0] != schema_version:
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS search_events")
+            connection.execute("DROP TABLE IF EXISTS indexed_matches")
+            connection.execute("DROP TABLE IF EXISTS players")
+            connection.execute("DROP TABLE IF EXISTS player_matches")
+            connection.execute(f"PRAGMA user_version = {schema_version}")
+
+    # Season of every listed match, so matches are indexed when they are stored
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS matches (
+            match_id INTEGER PRIMARY KEY,
+            competition_id INTEGER,
+            season_id INTEGER,
+            competition TEXT,
+            season TEXT,
+            match_date TEXT,
+            home_team TEXT,
+            away_team TEXT
+        )
+        """
+    )
+
+    # The events of each match are a contiguous rowid range of the index
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS indexed_matches (
+            match_id INTEGER PRIMARY KEY,
+            version TEXT,
+            first_rowid INTEGER,
+            last_rowid INTEGER
+        )
+        """
+    )
+
+    # Matches of each player, a player lookup only reads their own rows
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS players (
+            player_id INTEGER PRIMARY KEY,
+            name TEXT
+        )
+        """
+    )
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS player_matches (
+            player_id INTEGER,
+            match_id INTEGER,
+            team TEXT,
+            minutes INTEGER,
+            events TEXT,
+            PRIMARY KEY (player_id, match_id)
+        )
+        """
+    )
+    connection.execute(
+        "CREATE INDEX IF NOT EXISTS player_matches_match_id "
+        "ON player_matches (match_id)"
+    )
+
+    # The season is a token, so a season search is a single index lookup
+    connection.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_events USING fts5(
+            match_id UNINDEXED,
+            event_id UNINDEXED,
+            minute UNINDEXED,
+            season,
+            player,
+            team,
+            type,
+            outcome,
+            attributes,
+            tokenize = "unicode61 remove_diacritics 2"
+        )
+        """
+    )
+    return connection
+
+
+def get_search_season_token(competition_id, season_id):
+    # Letters and digits only, so the tokenizer keeps it as a single token
+    return f"s{int(competition_id)}x{int(season_id)}"
+
+
+def update_matches_catalog(competition_id, season_id, matches):
     competitions = get_competitions()
+    season = competitions[
+        (competitions["competition_id"] == competition_id)
+        & (competitions["season_id"] == season_id)
+    ]
+    with closing(get_index_connection()) as connection, connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    int(match.match_id),
+                    int(competition_id),
+                    int(season_id),
+                    season["competition_name"].values[0],
+                    season["season_name"].values[0],
+                    str(match.match_date),
+                    match.home_team,
+                    match.away_team,
+                )
+                for match in matches.itertuples(index=False)
+            ],
+        )
 
-    col1, col2, col3 = st.columns([1, 1, 1])
-    # Filter by country
-    with col1:
-        # Get selected country from state
-        country_name = competitions[
-            competitions["country_name"] == get_state("selected_country")
-        ]["country_name"].unique()[0]
+    # Matches stored before their season was in the catalog
+    for match_id in matches["match_id"]:
+        if is_match_events_stored(match_id):
+            index_match(int(match_id))
+
+
+def build_search_rows(match_id, season_token, events):
+    def join_columns(columns):
+        text = pd.Series("", index=events.index)
+        for column in columns:
+            if column in events.columns:
+                text = text.str.cat(events[column].fillna("").astype(str), sep=" ")
+        return text.str.strip()
+
+    search_columns = get_search_attribute_columns()
+    return zip(
+        [int(match_id)] * len(events),
+        events["id"],
+        events["minute"].astype(int),
+        [season_token] * len(events),
+        events["player"].fillna(""),
+        events["team"].fillna(""),
+        events["type"].fillna(""),
+        join_columns(search_columns["outcome"]),
+        join_columns(search_columns["attributes"]),
+    )
 
-        countries = competitions["country_name"].unique()
-        idx = countries.tolist().index(country_name)
 
-        selected_country = st.selectbox("Selecione um país", countries, index=idx)
-        competitions = competitions[competitions["country_name"] == selected_country]
-        set_state("selected_country", selected_country)
+def index_match(match_id):
+    version = get_cache_version()
+
+    with closing(get_index_connection()) as connection:
+        # Matches of a season not listed yet are indexed once it is
+        match = connection.execute(
+            "SELECT competition_id, season_id FROM matches WHERE match_id = ?",
+            (match_id,),
+        ).fetchone()
+        indexed = connection.execute(
+            "SELECT version, first_rowid, last_rowid FROM indexed_matches "
+            "WHERE match_id = ?",
+            (match_id,),
+        ).fetchone()
+        if match is None or (indexed and indexed[0] == version):
+            return
+        columns = read_match_events_manifest(match_id)
+        if columns is None:
+            return
+
+        search_columns = get_search_attribute_columns()
+        events = load_stored_match_events(
+            match_id,
+            [
+                column
+                for column in ["id", "minute", "player", "team", "type"]
+                + search_columns["outcome"]
+                + search_columns["attributes"]
+                if column in columns
+            ],
+        )
+        rows = list(
+            build_search_rows(match_id, get_search_season_token(*match), events)
+        )
+        players = get_match_players(match_id)
+
+        with connection:
+            # Lock the index, so the new rowid range is not taken by another writer
+            connection.execute("BEGIN IMMEDIATE")
+
+            # Events indexed by another cache version are replaced by their range
+            if indexed:
+                connection.execute(
+                    "DELETE FROM search_events WHERE rowid BETWEEN ? AND ?",
+                    (indexed[1], indexed[2]),
+                )
+            first_rowid = connection.execute(
+                "SELECT coalesce(max(last_rowid), 0) + 1 FROM indexed_matches"
+            ).fetchone()[0]
+            connection.executemany(
+                "INSERT INTO search_events (rowid, match_id, event_id, minute, "
+                "season, player, team, type, outcome, attributes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (first_rowid + position, *row)
+                    for position, row in enumerate(rows)
+                ),
+            )
+
+            # Players of the match
+            connection.execute(
+                "DELETE FROM player_matches WHERE match_id = ?", (match_id,)
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO players VALUES (?, ?)",
+                [
+                    (int(player_id), player["name"])
+                    for player_id, player in players.items()
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO player_matches VALUES (?, ?, ?, ?, ?)",
+                build_player_rows(match_id, players),
+            )
+
+            connection.execute(
+                "INSERT OR REPLACE INTO indexed_matches VALUES (?, ?, ?, ?)",
+                (match_id, version, first_rowid, first_rowid + len(rows) - 1),
+            )
+
+
+def search_events(
+    query,
+    competition_id=None,
+    season_id=None,
+    after=0,
+    page_size=50,
+    max_count=1000,
+):
+    # Every word must match, quoted so the user input is never parsed as syntax
+    terms = [term.replace('"', "") for term in query.split()]
+    match_query = " ".join(f'"{term}"' for term in terms if term)
+    if not match_query:
+        return 0, pd.DataFrame()
+    if competition_id is not None:
+        match_query += f" season:{get_search_season_token(competition_id, season_id)}"
+
+    with closing(get_index_connection()) as connection:
+        # Counting every hit grows with the index, so the count is capped
+        total = connection.execute(
+            "SELECT count(*) FROM "
+            "(SELECT 1 FROM search_events WHERE search_events MATCH ? LIMIT ?)",
+            (match_query, max_count),
+        ).fetchone()[0]
+
+        # Keyset pagination in insertion order, only the page is joined
+        hits = pd.read_sql_query(
+            """
+            SELECT
+                h.rowid, h.match_id, h.event_id, m.competition_id, m.season_id,
+                m.match_date, m.home_team, m.away_team, h.minute, h.player, h.team,
+                h.type, h.outcome, h.attributes
+            FROM (
+                SELECT
+                    rowid, match_id, event_id, minute, player, team, type, outcome,
+                    attributes
+                FROM search_events
+                WHERE search_events MATCH ? AND rowid > ?
+                ORDER BY rowid
+                LIMIT ?
+            ) h
+            JOIN matches m USING (match_id)
+            ORDER BY h.rowid
+            """,
+            connection,
+            params=(match_query, int(after), page_size),
+        )
+    return total, hits
+
+
+# --------------------------
+# HEATMAP FUNCTIONS
+# --------------------------
+
+
+def get_heatmap_grids():
+    # Uniform grids are (x bins, y bins), zones are (x edges, y edges)
+    return {
+        "6 x 5": (6, 5),
+        "12 x 8": (12, 8),
+        "Juego de Posición": (
+            (0, 18, 39, 60, 81, 102, 120),
+            (0, 18, 30, 50, 62, 80),
+        ),
+        "Terços": ((0, 40, 80, 120), (0, 80)),
+    }
+
+
+def get_heatmap_edges(grid):
+    x_bins, y_bins = grid
+    if isinstance(x_bins, int):
+        # StatsBomb pitch is 120 x 80
+        return np.linspace(0, 120, x_bins + 1), np.linspace(0, 80, y_bins + 1)
+    return np.asarray(x_bins, dtype=float), np.asarray(y_bins, dtype=float)
+
+
+def get_flow_statistic(x_start, y_start, x_end, y_end, grid=(6, 4)):
+    x_edges, y_edges = get_heatmap_edges(grid)
+    n_x, n_y = len(x_edges) - 1, len(y_edges) - 1
+
+    # Zone of each event start
+    x_bin = np.clip(np.digitize(x_start, x_edges) - 1, 0, n_x - 1)
+    y_bin = np.clip(np.digitize(y_start, y_edges) - 1, 0, n_y - 1)
+    zone = y_bin * n_x + x_bin
+
+    # Count and mean direction of the events in each zone
+    count = np.bincount(zone, minlength=n_x * n_y)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dx = np.bincount(zone, weights=x_end - x_start, minlength=n_x * n_y) / count
+        dy = np.bincount(zone, weights=y_end - y_start, minlength=n_x * n_y) / count
+
+    # Same layout as mplsoccer's bin_statistic, so it can be drawn by the pitch
+    x_grid, y_grid = np.meshgrid(x_edges, y_edges)
+    cx, cy = np.meshgrid(
+        (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+    )
+    return {
+        "statistic": count.reshape(n_y, n_x).astype(float),
+        "dx": dx.reshape(n_y, n_x),
+        "dy": dy.reshape(n_y, n_x),
+        "x_grid": x_grid,
+        "y_grid": y_grid,
+        "cx": cx,
+        "cy": cy,
+    }
 
-    # Filter by competition
-    with col2:
-        competition_names = competitions["competition_name"].unique()
 
-        # Get selected competition from state
-        competition_id = (
-            get_state("competition_id") or competitions["competition_id"].values[0]
+@st.cache_data(ttl=3600)
+def get_event_coordinates(match_id):
+    events = get_match_events(match_id, get_view_event_columns())
+    events = events[events["location"].notna()]
+
+    # Extract the coordinates once, so heatmaps only need to mask the arrays
+    coordinates = pd.DataFrame(
+        {
+            "label": events.index.values,
+            "type": events["type"].values,
+            "team": events["team"].values,
+            "player": events["player"].values,
+            "minute": events["minute"].values,
+            "x": pd.to_numeric(events["location"].str[0], errors="coerce").values,
+            "y": pd.to_numeric(events["location"].str[1], errors="coerce").values,
+        }
+    )
+    return coordinates[coordinates["x"].notna() & coordinates["y"].notna()]
+
+
+@st.cache_data(ttl=3600)
+def get_heatmap_statistic(
+    match_id,
+    team_name="",
+    event_types=("Carry",),
+    grid=(6, 5),
+    minute_range=None,
+    player="",
+    zone=None,
+):
+    coordinates = get_event_coordinates(match_id)
+
+    # Filter the coordinates
+    mask = coordinates["type"].isin(event_types).values
+    if team_name:
+        mask &= (coordinates["team"] == team_name).values
+    if player:
+        mask &= (coordinates["player"] == player).values
+    if minute_range:
+        mask &= coordinates["minute"].between(*minute_range).values
+    if zone:
+        mask &= np.isin(coordinates["label"].values, get_zone_labels(match_id, zone))
+
+    # Count the events in each zone
+    x_edges, y_edges = get_heatmap_edges(grid)
+    x = np.clip(coordinates["x"].values[mask], x_edges[0], x_edges[-1])
+    y = np.clip(coordinates["y"].values[mask], y_edges[0], y_edges[-1])
+    statistic, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+
+    # Same layout as mplsoccer's bin_statistic, so it can be drawn by the pitch
+    x_grid, y_grid = np.meshgrid(x_edges, y_edges)
+    cx, cy = np.meshgrid(
+        (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+    )
+    return {
+        "statistic": statistic.T,
+        "x_grid": x_grid,
+        "y_grid": y_grid,
+        "cx": cx,
+        "cy": cy,
+    }
+
+
+@st.cache_data(ttl=3600)
+def get_matches_heatmap_statistic(
+    match_ids,
+    team_name,
+    event_types=("Carry",),
+    grid=(6, 5),
+    minute_range=None,
+    zone=None,
+):
+    # Make sure every match is stored before reading them
+    store_matches_events(match_ids)
+
+    # Sum the cached statistics of each match
+    matches_statistic = None
+    for match_id in match_ids:
+        statistic = get_heatmap_statistic(
+            int(match_id), team_name, event_types, grid, minute_range, zone=zone
         )
-        idx = 0
-        # Check is the saved competition is in the current list
-        if competition_id not in competitions["competition_id"].values:
-            competition_id = competitions["competition_id"].values[0]
+        if matches_statistic is None:
+            matches_statistic = statistic
         else:
-            idx = competition_names.tolist().index(
-                competitions[competitions["competition_id"] == competition_id][
-                    "competition_name"
-                ].values[0]
+            matches_statistic["statistic"] += statistic["statistic"]
+    return matches_statistic
+
+
+@st.cache_data(ttl=3600)
+def get_season_heatmap_statistic(
+    competition_id,
+    season_id,
+    team_name,
+    event_types=("Carry",),
+    grid=(6, 5),
+    minute_range=None,
+    zone=None,
+):
+    matches = get_competition_matches(competition_id, season_id)
+    matches = matches[
+        (matches["home_team"] == team_name) | (matches["away_team"] == team_name)
+    ]
+    return get_matches_heatmap_statistic(
+        tuple(int(match_id) for match_id in matches["match_id"]),
+        team_name,
+        event_types,
+        grid,
+        minute_range,
+        zone,
+    )
+
+
+# --------------------------
+# SPATIAL INDEX FUNCTIONS
+# --------------------------
+
+
+def get_pitch_zones():
+    # (x min, x max, y min, y max), teams always attack to the right
+    return {
+        "Campo todo": None,
+        "Terço final": (80, 120, 0, 80),
+        "Terço médio": (40, 80, 0, 80),
+        "Terço defensivo": (0, 40, 0, 80),
+        "Grande área (ataque)": (102, 120, 18, 62),
+        "Grande área (defesa)": (0, 18, 18, 62),
+        "Meio-espaço esquerdo": (0, 120, 18, 30),
+        "Meio-espaço direito": (0, 120, 50, 62),
+        "Personalizada": None,
+    }
+
+
+def build_grid_index(labels, x, y, cell_size=5):
+    valid = np.isfinite(x) & np.isfinite(y)
+    labels, x, y = labels[valid], x[valid], y[valid]
+
+    # Cell of each event, on a uniform grid over the 120 x 80 pitch
+    n_x, n_y = int(np.ceil(120 / cell_size)), int(np.ceil(80 / cell_size))
+    cell_x = np.clip((x // cell_size).astype(int), 0, n_x - 1)
+    cell_y = np.clip((y // cell_size).astype(int), 0, n_y - 1)
+    cell = cell_y * n_x + cell_x
+
+    # Events sorted by cell, each cell is a slice between two offsets
+    order = np.argsort(cell, kind="stable")
+    offsets = np.concatenate(
+        [[0], np.cumsum(np.bincount(cell, minlength=n_x * n_y))]
+    )
+    return {
+        "labels": labels[order],
+        "x": x[order],
+        "y": y[order],
+        "offsets": offsets,
+        "n_x": n_x,
+        "n_y": n_y,
+        "cell_size": cell_size,
+    }
+
+
+def query_grid_index(grid_index, x_min, x_max, y_min, y_max):
+    cell_size, n_x, n_y = (
+        grid_index["cell_size"],
+        grid_index["n_x"],
+        grid_index["n_y"],
+    )
+    offsets = grid_index["offsets"]
+    cell_x_min = min(max(int(x_min // cell_size), 0), n_x - 1)
+    cell_x_max = min(max(int(x_max // cell_size), 0), n_x - 1)
+    cell_y_min = min(max(int(y_min // cell_size), 0), n_y - 1)
+    cell_y_max = min(max(int(y_max // cell_size), 0), n_y - 1)
+
+    # The cells of a grid row are contiguous in the sorted arrays
+    candidates = np.concatenate(
+        [
+            np.arange(
+                offsets[cell_y * n_x + cell_x_min],
+                offsets[cell_y * n_x + cell_x_max + 1],
             )
+            for cell_y in range(cell_y_min, cell_y_max + 1)
+        ]
+    )
+
+    # Only the cells on the border can have events outside the zone
+    x, y = grid_index["x"][candidates], grid_index["y"][candidates]
+    inside = (x >= x_min) & (x <= x_max) & (y >= y_min) & (y <= y_max)
+    return np.sort(grid_index["labels"][candidates[inside]])
+
+
+@st.cache_data(ttl=3600)
+def get_spatial_index(match_id):
+    events = get_match_events(match_id, get_view_event_columns())
+    labels = events.index.values
+
+    def coordinates(locations, i):
+        return pd.to_numeric(locations.str[i], errors="coerce").values.astype(float)
+
+    # End location of passes, carries and shots
+    end_location = pd.Series(None, index=events.index, dtype=object)
+    for column in ["pass_end_location", "carry_end_location", "shot_end_location"]:
+        if column in events.columns:
+            end_location = end_location.combine_first(events[column])
+
+    return {
+        "Origem": build_grid_index(
+            labels,
+            coordinates(events["location"], 0),
+            coordinates(events["location"], 1),
+        ),
+        "Destino": build_grid_index(
+            labels, coordinates(end_location, 0), coordinates(end_location, 1)
+        ),
+    }
+
+
+def get_zone_labels(match_id, zone):
+    # Zone filters are (event location, x min, x max, y min, y max)
+    location, *bounds = zone
+    return query_grid_index(get_spatial_index(match_id)[location], *bounds)
+
 
-        selected_competition = st.selectbox(
-            "Selecione uma competição", competition_names, index=idx
+# --------------------------
+# POSSESSION CHAIN FUNCTIONS
+# --------------------------
+
+
+@st.cache_data(ttl=3600)
+def get_possession_chains(match_id, zone=None):
+    events = get_match_events(match_id, get_view_event_columns())
+
+    # Only the chains with an event in the zone
+    if zone:
+        zone_possessions = events.loc[get_zone_labels(match_id, zone), "possession"]
+        events = events[events["possession"].isin(zone_possessions.dropna())]
+    events = events[events["possession"].notna()].sort_values("index")
+
+    # End of each event, passes and carries end where the ball was moved to
+    end_location = events["location"]
+    for column in ["shot_end_location", "carry_end_location", "pass_end_location"]:
+        if column in events.columns:
+            end_location = events[column].combine_first(end_location)
+
+    # Only the passes and shots of the team in possession count for the chain
+    in_possession = events["team"] == events["possession_team"]
+    xg = (
+        events["shot_statsbomb_xg"].fillna(0)
+        if "shot_statsbomb_xg" in events.columns
+        else pd.Series(0.0, index=events.index)
+    )
+
+    chain_events = pd.DataFrame(
+        {
+            "possession": events["possession"].values,
+            "team": events["possession_team"].values,
+            "minute": events["minute"].values,
+            "time": (events["minute"] * 60 + events["second"]).values,
+            "x": pd.to_numeric(events["location"].str[0], errors="coerce").values,
+            "y": pd.to_numeric(events["location"].str[1], errors="coerce").values,
+            "end_x": pd.to_numeric(end_location.str[0], errors="coerce").values,
+            "end_y": pd.to_numeric(end_location.str[1], errors="coerce").values,
+            "xg": (xg * in_possession).values,
+            "shot": ((events["type"] == "Shot") & in_possession).values,
+            "pass": ((events["type"] == "Pass") & in_possession).values,
+        }
+    )
+
+    # Group the events into chains once, the charts only mask these arrays
+    chains = chain_events.groupby("possession", sort=True).agg(
+        team=("team", "first"),
+        start_minute=("minute", "first"),
+        start_time=("time", "first"),
+        end_time=("time", "last"),
+        events=("minute", "size"),
+        passes=("pass", "sum"),
+        start_x=("x", "first"),
+        start_y=("y", "first"),
+        end_x=("end_x", "last"),
+        end_y=("end_y", "last"),
+        xg=("xg", "sum"),
+    )
+
+    # A chain ends in a shot when the last event of the team in possession is one,
+    # possessions can go on after a blocked shot is recovered
+    chains["shot"] = (
+        chain_events[in_possession.values]
+        .groupby("possession")["shot"]
+        .last()
+        .reindex(chains.index, fill_value=False)
+    )
+    return {
+        "team": chains["team"].values,
+        "start_minute": chains["start_minute"].values.astype(np.int16),
+        "duration": (chains["end_time"] - chains["start_time"]).values.astype(
+            np.float32
+        ),
+        "events": chains["events"].values.astype(np.int16),
+        "passes": chains["passes"].values.astype(np.int16),
+        # Thirds of the pitch: 0 defensive, 1 middle and 2 final
+        "start_zone": np.digitize(chains["start_x"].values, [40, 80]).astype(np.int8),
+        "end_zone": np.digitize(chains["end_x"].values, [40, 80]).astype(np.int8),
+        "xg": chains["xg"].values.astype(np.float32),
+        "shot": chains["shot"].values.astype(bool),
+    }
+
+
+def filter_possession_chains(chains, team_name="", minute_range=None):
+    mask = np.ones(len(chains["team"]), dtype=bool)
+    if team_name:
+        mask &= chains["team"] == team_name
+    if minute_range:
+        mask &= (chains["start_minute"] >= minute_range[0]) & (
+            chains["start_minute"] <= minute_range[1]
         )
-        competition = competitions[
-            competitions["competition_name"] == selected_competition
+    return {key: values[mask] for key, values in chains.items()}
+
+
+def get_possession_chains_metrics(chains):
+    n_chains = len(chains["team"])
+    if not n_chains:
+        return {"chains": 0, "duration": 0, "passes": 0, "shot": 0, "xg": 0}
+    return {
+        "chains": n_chains,
+        "duration": float(chains["duration"].mean()),
+        "passes": float(chains["passes"].mean()),
+        "shot": float(chains["shot"].mean()),
+        "xg": float(chains["xg"].sum()),
+    }
+
+
+# --------------------------
+# PASS NETWORK FUNCTIONS
+# --------------------------
+
+
+@st.cache_data(ttl=3600)
+def get_pass_network_arrays(match_id, team_name, zone=None):
+    events = get_match_events(match_id, get_view_event_columns())
+
+    # Completed passes have no outcome
+    mask = (
+        (events["type"] == "Pass")
+        & (events["team"] == team_name)
+        & events["pass_outcome"].isna()
+        & events["pass_recipient"].notna()
+        & events["location"].notna()
+    )
+    if zone:
+        mask &= events.index.isin(get_zone_labels(match_id, zone))
+    passes = events[mask]
+
+    # Map each player to a row/column of the adjacency matrix
+    players = np.unique(
+        np.concatenate([passes["player"].values, passes["pass_recipient"].values])
+    )
+    passer = np.searchsorted(players, passes["player"].values)
+    recipient = np.searchsorted(players, passes["pass_recipient"].values)
+    minutes = passes["minute"].values.astype(int)
+    locations = np.column_stack(
+        [
+            pd.to_numeric(passes["location"].str[0], errors="coerce").values,
+            pd.to_numeric(passes["location"].str[1], errors="coerce").values,
         ]
-        competition_id = competition["competition_id"].values[0]
+    )
+
+    # Count passes and locations by minute
+    n_minutes = int(events["minute"].max()) + 1
+    n_players = len(players)
+    adjacency = np.zeros((n_minutes, n_players, n_players), dtype=np.int32)
+    location_sum = np.zeros((n_minutes, n_players, 2))
+    location_count = np.zeros((n_minutes, n_players), dtype=np.int32)
+    np.add.at(adjacency, (minutes, passer, recipient), 1)
+    np.add.at(location_sum, (minutes, passer), locations)
+    np.add.at(location_count, (minutes, passer), 1)
+
+    # Cumulative sums, so any time window is a single subtraction
+    return {
+        "players": players,
+        "adjacency": adjacency.cumsum(axis=0),
+        "location_sum": location_sum.cumsum(axis=0),
+        "location_count": location_count.cumsum(axis=0),
+    }
+
+
+@st.cache_data(ttl=3600)
+def get_pass_network(match_id, team_name, minute_range=None, zone=None):
+    arrays = get_pass_network_arrays(match_id, team_name, zone)
+    n_minutes = len(arrays["adjacency"])
+
+    # Get the time window
+    start, end = minute_range or (0, n_minutes - 1)
+    end = min(int(end), n_minutes - 1)
+    start = max(int(start), 0)
+
+    def window(cumulative):
+        if start > 0:
+            return cumulative[end] - cumulative[start - 1]
+        return cumulative[end]
+
+    adjacency = window(arrays["adjacency"])
+    location_count = window(arrays["location_count"])
+    location_sum = window(arrays["location_sum"])
+
+    # Average position of each player when passing
+    with np.errstate(invalid="ignore", divide="ignore"):
+        centroids = location_sum / location_count[:, None]
+
+    return {
+        "players": arrays["players"],
+        "adjacency": adjacency,
+        "centroids": centroids,
+        "pass_count": location_count,
+    }
+
+
+# --------------------------
+# MEMORY PROFILING FUNCTIONS
+# --------------------------
+
+
+def get_column_cardinality(column):
+    try:
+        return int(column.nunique())
+    except TypeError:
+        # Lists and dicts are not hashable
+        return int(column.dropna().astype(str).nunique())
+
+
+def suggest_column_compaction(column, null_ratio, cardinality):
+    non_null = len(column) - column.isna().sum()
+    if null_ratio == 1:
+        return "drop"
+    if pd.api.types.is_bool_dtype(column) or pd.api.types.is_numeric_dtype(column):
+        # Rare attributes (e.g. xG) are mostly nulls
+        if null_ratio >= 0.9:
+            return "sparse"
+        if pd.api.types.is_integer_dtype(column) or pd.api.types.is_float_dtype(
+            column
+        ):
+            return "downcast"
+        return ""
+    if column.dtype == object:
+        values = column.dropna()
+        is_text = values.map(lambda value: isinstance(value, str)).all()
+        if is_text and non_null and cardinality / non_null <= 0.5:
+            return "category"
+    return ""
+
+
+def profile_events_df(events):
+    rows = []
+    for name in events.columns:
+        column = events[name]
+        null_ratio = float(column.isna().mean()) if len(column) else 1.0
+        cardinality = get_column_cardinality(column)
+        rows.append(
+            {
+                "column": name,
+                "dtype": str(column.dtype),
+                "memory": int(column.memory_usage(deep=True, index=False)),
+                "null_ratio": null_ratio,
+                "cardinality": cardinality,
+                "suggestion": suggest_column_compaction(
+                    column, null_ratio, cardinality
+                ),
+            }
+        )
+    profile = pd.DataFrame(rows)
+    return profile.sort_values("memory", ascending=False, ignore_index=True)
+
+
+def compact_events_df(events, profile):
+    compacted = {}
+    for row in profile.itertuples(index=False):
+        column = events[row.column]
+        if row.suggestion == "drop":
+            continue
+        elif row.suggestion == "sparse":
+            column = column.astype(pd.SparseDtype(column.dtype))
+        elif row.suggestion == "downcast":
+            kind = "integer" if pd.api.types.is_integer_dtype(column) else "float"
+            column = pd.to_numeric(column, downcast=kind)
+        elif row.suggestion == "category":
+            column = column.astype("category")
+        compacted[row.column] = column
+
+    # Keep the original column order
+    return pd.DataFrame(
+        {name: compacted[name] for name in events.columns if name in compacted}
+    )
+
+
+def is_debug_enabled():
+    # Per-session details are only shown to whoever runs the server
+    return os.environ.get("STATSBOMB_DEBUG", "") not in ("", "0")
+
+
+def get_cache_memory_df(show_sessions=False):
+    # Memory held by the Streamlit caches and the session states
+    try:
+        from streamlit.runtime import Runtime
+
+        stats = Runtime.instance().stats_mgr.get_stats()
+    except Exception:
+        return pd.DataFrame(columns=["category", "cache", "entries", "memory"])
+
+    # Cache entries are grouped by the cached function. Session states are
+    # reported without a name, so they are either numbered in the order they
+    # are reported or summed into a single row
+    rows = []
+    n_sessions = 0
+    for stat in stats:
+        cache_name = stat.cache_name or stat.category_name
+        if stat.category_name == "st_session_state":
+            n_sessions += 1
+            cache_name = f"Sessão #{n_sessions}" if show_sessions else "Sessões"
+        rows.append((stat.category_name, cache_name, stat.byte_length))
+
+    stats_df = pd.DataFrame(rows, columns=["category", "cache", "memory"])
+    return (
+        stats_df.groupby(["category", "cache"])
+        .agg(entries=("memory", "size"), memory=("memory", "sum"))
+        .reset_index()
+        .sort_values("memory", ascending=False, ignore_index=True)
+    )
+
+
+def format_bytes(value):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.1f} {unit}"
+        value /= 1024
+
+
+# --------------------------
+# STATSBOMB DATA SELECTORS
+# --------------------------
+
+
+def index_selector(label, node, selected_id=None):
+    # Fallback to the first option if the saved id is not available
+    idx = node["positions"].get(selected_id, 0)
+    selected_name = st.selectbox(label, node["options"], index=idx)
+    selected_id = node["ids"][selected_name]
+    return selected_id, node["children"][selected_id]
+
+
+def competitions_selector():
+    # Get competitions index
+    competitions_index = get_competitions_index()
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    # Filter by country
+    with col1:
+        selected_country, country = index_selector(
+            "Selecione um país", competitions_index, get_state("selected_country")
+        )
+        set_state("selected_country", selected_country)
+
+    # Filter by competition
+    with col2:
+        competition_id, competition = index_selector(
+            "Selecione uma competição", country, get_state("competition_id")
+        )
         set_state("competition_id", int(competition_id))
 
     # Filter by season
     with col3:
-        seasons = competition["season_name"].unique()
-
-        # Get selected season from state
-        season_id = get_state("season_id") or competition["season_id"].values[0]
-        idx = 0
-        # Check is the saved season is in the current list
-        if season_id not in competition["season_id"].values:
-            season_id = competition["season_id"].values[0]
-        else:
-            idx = seasons.tolist().index(
-                competition[competition["season_id"] == season_id][
-                    "season_name"
-                ].values[0]
-            )
-
-        selected_season = st.selectbox("Selecione uma temporada", seasons, index=idx)
-        season = competition[competition["season_name"] == selected_season]
-        season_id = season["season_id"].values[0]
+        season_id, season = index_selector(
+            "Selecione uma temporada", competition, get_state("season_id")
+        )
         set_state("season_id", int(season_id))
 
     return competition_id, season_id
 
 
 def matches_selector(competition_id: int, season_id: int):
+    # Stop prefetching the matches of the previous season
+    prefetch = get_state("prefetch")
+    if prefetch and prefetch["season"] != (competition_id, season_id):
+        cancel_prefetch()
+
     # Get matches DataFrame
     matches = get_competition_matches(competition_id, season_id)
 
@@ -376,16 +2036,97 @@ def matches_selector(competition_id: int, season_id: int):
     # Show matches selector
     match_name = st.selectbox("Selecione uma partida", match_names, index=idx)
     match_id = int(match_name.split("-")[-1].strip())
+    if match_id != get_state("match_id"):
+        record_match_switch(match_id)
     set_state("match_id", match_id)
 
-    # Get match data
-    match_events_df = get_match_events(match_id)
+    # Stop loading the previous match, even if the new one is already stored
+    load = get_state("events_load")
+    if load and load["match_id"] != match_id:
+        cancel_match_events_load()
+
+    # Start loading the match events in background
+    if not is_match_events_stored(match_id):
+        start_match_events_load(match_id)
+
+    # Show the season results, from the matches already loaded
+    with st.expander("📋 Resultados da Temporada"):
+        st.dataframe(
+            get_season_results_df(competition_id, season_id),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    return match_id, match_name
+
 
-    return match_id, match_name, match_events_df
+def multi_matches_selector(competition_id: int, season_id: int):
+    # Get matches DataFrame
+    matches = get_competition_matches(competition_id, season_id)
+
+    col1, col2 = st.columns(2)
+    # Filter by team
+    with col1:
+        teams = sorted(set(matches["home_team"]) | set(matches["away_team"]))
+        team = st.selectbox("Selecione um time", teams)
+        team_matches = matches[
+            (matches["home_team"] == team) | (matches["away_team"] == team)
+        ].sort_values("match_date")
+
+    # Filter by matches
+    with col2:
+        modes = ["Últimas partidas", "Mata-mata", "Seleção manual"]
+        mode = st.selectbox("Selecione as partidas", modes)
+
+    if mode == "Últimas partidas":
+        n_matches = len(team_matches)
+        if n_matches > 1:
+            n_matches = st.slider(
+                "Número de partidas",
+                min_value=1,
+                max_value=n_matches,
+                value=min(5, n_matches),
+            )
+        team_matches = team_matches.tail(n_matches)
+    elif mode == "Mata-mata":
+        # Knockout matches are the ones outside the group/league stage
+        if "competition_stage" in team_matches.columns:
+            team_matches = team_matches[
+                ~team_matches["competition_stage"].isin(
+                    ["Regular Season", "Group Stage"]
+                )
+            ]
+    else:
+        match_ids = team_matches["match_id"].tolist()
+        match_names = [
+            generate_match_name(matches, match_id) for match_id in match_ids
+        ]
+        selected_names = st.multiselect(
+            "Partidas", match_names, default=match_names[-2:]
+        )
+        team_matches = team_matches[
+            [name in selected_names for name in match_names]
+        ]
+
+    match_ids = tuple(int(match_id) for match_id in team_matches["match_id"])
+    return team, match_ids
+
+
+def open_match(competition_id, season_id, match_id):
+    # Show the match in the explore view
+    competitions = get_competitions()
+    competition = competitions[competitions["competition_id"] == competition_id]
+    set_state("selected_country", competition["country_name"].values[0])
+    set_state("competition_id", int(competition_id))
+    set_state("season_id", int(season_id))
+    set_state("match_id", int(match_id))
+    set_state("current_explore_view", "Análise da Partida")
+    set_state("current_view", "🔍 Explorar")
+    st.rerun()
 
 
 def explore_view_selector():
-    explore_options = ["Análise da Partida", "Explorar DataFrame"]
+    explore_options = ["Análise da Partida", "Explorar DataFrame", "Perfil de Memória"]
     idx = explore_options.index(get_state("current_explore_view") or explore_options[0])
     explore_view = st.selectbox(
         "Opções de Visualização",
@@ -448,8 +2189,56 @@ def display_match_score(score_obj):
         )
 
 
-def display_overall_match_stats(match_events_df, home_team, alway_team):
-    stats = get_match_events_count_dict(match_events_df)
+def display_match_metrics(match_events_df, team=""):
+    # With a team, show its own totals, compared against all of its opponents
+    if team:
+        match_events_df = match_events_df.assign(
+            team=match_events_df["team"].where(
+                match_events_df["team"] == team, "Adversários"
+            )
+        )
+
+    def count(events):
+        if team:
+            events = events[events["team"] == team]
+        return len(events)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(
+        "Chutes",
+        count(match_events_df[match_events_df["type"] == "Shot"]),
+        delta=get_team_metrics_comparison(
+            match_events_df[match_events_df["type"] == "Shot"]
+        ),
+    )
+    col2.metric(
+        "Chutes ao Gol",
+        count(get_shots_on_goal_df(match_events_df)),
+        delta=get_team_metrics_comparison(get_shots_on_goal_df(match_events_df)),
+    )
+    col3.metric(
+        "Passes",
+        count(match_events_df[match_events_df["type"] == "Pass"]),
+        delta=get_team_metrics_comparison(
+            match_events_df[match_events_df["type"] == "Pass"]
+        ),
+    )
+    col4.metric(
+        "Faltas Cometidas",
+        count(match_events_df[match_events_df["type"] == "Foul Committed"]),
+        delta=get_team_metrics_comparison(
+            match_events_df[match_events_df["type"] == "Foul Committed"],
+        ),
+    )
+
+
+def display_overall_match_stats(stats, home_team, alway_team):
+    if stats is None:
+        # Placeholder while the match events are loading
+        stats_names = get_default_stats_map().keys()
+        stats = {
+            team: dict.fromkeys(stats_names, "-") for team in (home_team, alway_team)
+        }
     with st.container(border=True):
         col1, col2, col3 = st.columns(get_vs_column_cfg())
         stats_names = list(stats[home_team].keys())
@@ -479,7 +2268,14 @@ def display_overall_match_stats(match_events_df, home_team, alway_team):
 
 
 @st.cache_data(ttl=3600)
-def plot_event_map(match_events_df, team_name="", event_type="Pass", color="blue"):
+def plot_event_map(
+    match_events_df,
+    team_name="",
+    event_type="Pass",
+    color="blue",
+    max_arrows=200,
+    flow_grid=(6, 4),
+):
     with st.spinner("Carregando..."):
         try:
             # Filter for events by the given team
@@ -497,20 +2293,81 @@ def plot_event_map(match_events_df, team_name="", event_type="Pass", color="blue
             # Set up the pitch plot
             fig, ax = pitch.draw(figsize=(10, 7))
 
-            # Plot the passes
+            # Get the start and end coordinates
             event_name = event_type.lower()
-            pitch.arrows(
-                events["location"].str[0],
-                events["location"].str[1],
-                events[f"{event_name}_end_location"].str[0],
-                events[f"{event_name}_end_location"].str[1],
-                width=2,
-                headwidth=3,
-                headlength=5,
-                color=color,
-                ax=ax,
-                label=f"{event_type}s",
-            )
+            x_start = pd.to_numeric(events["location"].str[0], errors="coerce")
+            y_start = pd.to_numeric(events["location"].str[1], errors="coerce")
+            end_location = events[f"{event_name}_end_location"]
+            x_end = pd.to_numeric(end_location.str[0], errors="coerce")
+            y_end = pd.to_numeric(end_location.str[1], errors="coerce")
+
+            # Plot the passes
+            if len(events) <= max_arrows:
+                pitch.arrows(
+                    x_start,
+                    y_start,
+                    x_end,
+                    y_end,
+                    width=2,
+                    headwidth=3,
+                    headlength=5,
+                    color=color,
+                    ax=ax,
+                    label=f"{event_type}s",
+                )
+
+            # Too many events, plot the mean direction of each zone instead
+            else:
+                valid = (
+                    x_start.notna() & y_start.notna() & x_end.notna() & y_end.notna()
+                ).values
+                flow = get_flow_statistic(
+                    x_start.values[valid],
+                    y_start.values[valid],
+                    x_end.values[valid],
+                    y_end.values[valid],
+                    flow_grid,
+                )
+                pitch.heatmap(
+                    flow, ax=ax, cmap="Greys", alpha=0.4, edgecolors="#22312b"
+                )
+
+                # Arrows have the same length, pointing to the mean direction
+                zone_size = min(
+                    np.diff(flow["x_grid"][0]).min(),
+                    np.diff(flow["y_grid"][:, 0]).min(),
+                )
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    length = np.hypot(flow["dx"], flow["dy"])
+                    ux, uy = flow["dx"] / length, flow["dy"] / length
+                active = (flow["statistic"] > 0) & (length > 0)
+                pitch.arrows(
+                    flow["cx"][active] - ux[active] * zone_size * 0.35,
+                    flow["cy"][active] - uy[active] * zone_size * 0.35,
+                    flow["cx"][active] + ux[active] * zone_size * 0.35,
+                    flow["cy"][active] + uy[active] * zone_size * 0.35,
+                    width=4,
+                    headwidth=3,
+                    headlength=3,
+                    color=color,
+                    ax=ax,
+                    label=f"{event_type}s",
+                )
+                pitch.label_heatmap(
+                    flow,
+                    color="white",
+                    fontsize=9,
+                    ax=ax,
+                    ha="center",
+                    va="center",
+                    yoffset=zone_size * 0.4,
+                    str_format="{:.0f}",
+                    exclude_zeros=True,
+                )
+                st.caption(
+                    f"{len(events)} eventos, exibindo a direção média por zona. "
+                    "Use os filtros para ver os eventos individualmente."
+                )
 
             # Add title and display plot
             st.pyplot(fig)
@@ -522,48 +2379,19 @@ def plot_event_map(match_events_df, team_name="", event_type="Pass", color="blue
 
 
 @st.cache_data(ttl=3600)
-def plot_events_heatmap(
-    match_events_df,
-    team_name="",
-    event_type="Pass",
-):
+def plot_events_heatmap(bin_statistic):
     with st.spinner("Carregando..."):
         try:
-            # Filter for events
-            events = match_events_df[(match_events_df["type"] == event_type)]
-
-            # Filter for events by the given team
-            if team_name:
-                events = events[events["team"] == team_name]
-
-            # Ensure that 'location' column is available and contains coordinates
-            if "location" not in events.columns or events["location"].isnull().all():
-                st.warning("No location data available to plot the heatmap.")
-                return
-
-            # Extract 'x' and 'y' coordinates from 'location' (ensure it's a valid list of [x, y] coordinates)
-            locations = (
-                events["location"]
-                .dropna()
-                .apply(
-                    lambda loc: (
-                        loc
-                        if isinstance(loc, list)
-                        and len(loc) == 2
-                        and all(isinstance(i, (int, float)) for i in loc)
-                        else None
-                    )
-                )
-                .dropna()
-            )
-
-            # Convert list of valid locations to a DataFrame
-            if locations.empty:
+            # Ensure that there are events to plot
+            if bin_statistic is None or not bin_statistic["statistic"].sum():
                 st.warning("⚠️ Dados inválidos para gerar o heatmap.")
                 return
 
-            # Create a DataFrame of x, y coordinates
-            locations_df = pd.DataFrame(locations.tolist(), columns=["x", "y"])
+            # Normalize the statistics as a percentage of the total number of events
+            bin_statistic = dict(
+                bin_statistic,
+                statistic=bin_statistic["statistic"] / bin_statistic["statistic"].sum(),
+            )
 
             # Create the pitch
             pitch = Pitch(
@@ -576,26 +2404,12 @@ def plot_events_heatmap(
             # Set up the pitch plot
             fig, ax = pitch.draw(figsize=(10, 7))
 
-            # Calculate the bin statistics
-            bin_statistic = pitch.bin_statistic(
-                locations_df["x"],
-                locations_df["y"],
-                statistic="count",
-                bins=(6, 5),
-                normalize=True,
-            )
-
-            # Normalize the statistics  as a percentage of the total number of events
-            bin_statistic["statistic"] = (
-                bin_statistic["statistic"] / bin_statistic["statistic"].sum()
-            )
-
             # Plot the heatmap on the pitch
             pitch.heatmap(bin_statistic, ax=ax, cmap="coolwarm", edgecolors="#22312b")
             labels = pitch.label_heatmap(
                 bin_statistic,
                 color="#f4edf0",
-                fontsize=18,
+                fontsize=18 if bin_statistic["statistic"].size <= 30 else 10,
                 ax=ax,
                 ha="center",
                 va="center",
@@ -613,6 +2427,88 @@ def plot_events_heatmap(
         return True
 
 
+@st.cache_data(ttl=3600)
+def plot_pass_network(pass_network, color="blue", min_passes=2):
+    with st.spinner("Carregando..."):
+        try:
+            players = pass_network["players"]
+            centroids = pass_network["centroids"]
+            pass_count = pass_network["pass_count"]
+
+            # Ensure that there are passes to plot
+            if not pass_count.sum():
+                st.warning("⚠️ Dados inválidos para gerar a rede de passes.")
+                return
+
+            # Passes between each pair of players, in both directions
+            pairs = pass_network["adjacency"] + pass_network["adjacency"].T
+            passer, recipient = np.triu_indices(len(players), k=1)
+            pair_count = pairs[passer, recipient]
+            visible = (
+                (pair_count >= min_passes)
+                & (pass_count[passer] > 0)
+                & (pass_count[recipient] > 0)
+            )
+            passer, recipient = passer[visible], recipient[visible]
+            pair_count = pair_count[visible]
+
+            # Create the pitch
+            pitch = Pitch(
+                pitch_type="statsbomb", pitch_color="grass", line_color="white"
+            )
+
+            # Set up the pitch plot
+            fig, ax = pitch.draw(figsize=(10, 7))
+
+            # Plot the connections, thicker lines for more passes
+            if len(pair_count):
+                pitch.lines(
+                    centroids[passer, 0],
+                    centroids[passer, 1],
+                    centroids[recipient, 0],
+                    centroids[recipient, 1],
+                    lw=1 + 9 * pair_count / pair_count.max(),
+                    color=color,
+                    alpha=0.6,
+                    zorder=1,
+                    ax=ax,
+                )
+
+            # Plot the players, bigger nodes for more passes
+            active = pass_count > 0
+            pitch.scatter(
+                centroids[active, 0],
+                centroids[active, 1],
+                s=200 + 1000 * pass_count[active] / pass_count.max(),
+                color=color,
+                edgecolors="white",
+                linewidth=1.5,
+                zorder=2,
+                ax=ax,
+            )
+            for name, (x, y) in zip(players[active], centroids[active]):
+                pitch.annotate(
+                    name.split(" ")[-1],
+                    xy=(x, y),
+                    xytext=(0, -18),
+                    textcoords="offset points",
+                    color="white",
+                    fontsize=9,
+                    ha="center",
+                    va="center",
+                    zorder=3,
+                    ax=ax,
+                )
+
+            # Add title and display plot
+            st.pyplot(fig)
+        except Exception as e:
+            st.warning(
+                f"⚠️ Não é possível gerar uma visualização para os dados selecionados."
+            )
+        return True
+
+
 @st.cache_data(ttl=3600)
 def plot_bar_chart_events_by_player(
     match_events_df,
@@ -668,6 +2564,75 @@ def plot_bar_chart_events_by_player(
         return True
 
 
+@st.cache_data(ttl=3600)
+def plot_possession_chains_length(chains, team_column_name="Time"):
+    with st.spinner("Carregando..."):
+        try:
+            chains_df = pd.DataFrame(
+                {
+                    team_column_name: chains["team"],
+                    "passes": np.minimum(chains["passes"], 15),
+                    "shot": np.where(chains["shot"], "Com Chute", "Sem Chute"),
+                }
+            )
+
+            # Create a histogram of passes per chain, 15+ in the last bin
+            fig = px.histogram(
+                chains_df,
+                x="passes",
+                color=team_column_name,
+                barmode="group",
+                nbins=16,
+                title="Passes por Sequência de Posse",
+                labels={"passes": "Passes na Sequência (15+)"},
+            )
+            fig.update_layout(yaxis_title="Sequências")
+
+            # Display the plot
+            st.plotly_chart(fig)
+        except Exception as e:
+            st.warning(
+                f"⚠️ Não é possível gerar uma visualização para os dados selecionados."
+            )
+        return True
+
+
+@st.cache_data(ttl=3600)
+def plot_possession_chains_zones(chains, team_name=""):
+    with st.spinner("Carregando..."):
+        try:
+            zones = np.array(["Terço Defensivo", "Terço Médio", "Terço Final"])
+
+            # Count chains by start zone and whether they ended in a shot
+            counts = np.zeros((3, 2), dtype=int)
+            np.add.at(counts, (chains["start_zone"], chains["shot"].astype(int)), 1)
+            zones_df = pd.DataFrame(
+                {
+                    "zone": np.repeat(zones, 2),
+                    "shot": np.tile(["Sem Chute", "Com Chute"], 3),
+                    "count": counts.ravel(),
+                }
+            )
+
+            # Create a bar chart
+            fig = px.bar(
+                zones_df,
+                x="zone",
+                y="count",
+                color="shot",
+                title=f"Início das Sequências de Posse - {team_name}",
+                labels={"zone": "Zona de Início", "count": "Sequências", "shot": ""},
+            )
+
+            # Display the plot
+            st.plotly_chart(fig)
+        except Exception as e:
+            st.warning(
+                f"⚠️ Não é possível gerar uma visualização para os dados selecionados."
+            )
+        return True
+
+
 @st.cache_data(ttl=3600)
 def plot_area_graph_events_by_team(
     match_events_df,
@@ -723,23 +2688,65 @@ def view_explore():
     competition_id, season_id = competitions_selector()
 
     # Show matches selector
-    match_id, match_name, match_events_df = matches_selector(competition_id, season_id)
+    match_id, match_name = matches_selector(competition_id, season_id)
 
     # Show explore view selector
     current_explore_view = explore_view_selector()
 
-    # -- Explore the data
+    # Show the match summary placeholders while the events are loading
     if current_explore_view == "Análise da Partida":
         st.write(f"---")
+        score_placeholder = st.empty()
+        stats_placeholder = st.empty()
+        if not is_match_events_stored(match_id):
+            home_team, alway_team = get_teams(competition_id, season_id, match_id)
+            with score_placeholder.container():
+                display_match_score(
+                    {
+                        "home_team_name": home_team,
+                        "home_team_open_play": "-",
+                        "home_team_penalty": 0,
+                        "home_team_player_goals": "",
+                        "alway_team_name": alway_team,
+                        "alway_team_open_play": "-",
+                        "alway_team_penalty": 0,
+                        "alway_team_player_goals": "",
+                    }
+                )
+            with stats_placeholder.container():
+                display_overall_match_stats(None, home_team, alway_team)
 
-        #  ---- Match summary
+    # Wait for the background load
+    if not is_match_events_stored(match_id):
+        wait_match_events_load(match_id, st.empty())
+
+    # Match summary, rendered from the stored summary before loading the events
+    if current_explore_view == "Análise da Partida":
         score_obj = generate_match_score_dict(competition_id, season_id, match_id)
         home_team = score_obj["home_team_name"]
         alway_team = score_obj["alway_team_name"]
-        display_match_score(score_obj)
+        with score_placeholder.container():
+            display_match_score(score_obj)
 
         # Match stats
-        display_overall_match_stats(match_events_df, home_team, alway_team)
+        summary = get_match_summary(match_id)
+        stats = {
+            team: summary.get(team, get_empty_team_summary())["stats"]
+            for team in (home_team, alway_team)
+        }
+        with stats_placeholder.container():
+            display_overall_match_stats(stats, home_team, alway_team)
+
+    # Warm the cache for the matches the user will probably open next
+    prefetch_matches(competition_id, season_id, match_id)
+
+    # Get match data, only the columns needed by the current view are loaded
+    match_events_df = get_match_events(
+        match_id, get_view_event_columns(current_explore_view)
+    )
+
+    # -- Explore the data
+    if current_explore_view == "Análise da Partida":
 
         # Save a copy of the unfiltered DataFrame
         original_match_events_df = match_events_df.copy()
@@ -747,12 +2754,34 @@ def view_explore():
         #  ---- Filters
         st.markdown("  ")
         with st.expander("⚙️ Filtrar", expanded=True):
+            # Zone filter
+            col1, col2 = st.columns(2)
+            with col1:
+                pitch_zones = get_pitch_zones()
+                zone_name = st.selectbox("Filtrar por Zona", list(pitch_zones))
+                zone = pitch_zones[zone_name]
+            with col2:
+                zone_location = st.selectbox(
+                    "Localização do Evento", ["Origem", "Destino"]
+                )
+            if zone_name == "Personalizada":
+                col1, col2 = st.columns(2)
+                zone_x = col1.slider("Zona - Comprimento (x)", 0, 120, (80, 120))
+                zone_y = col2.slider("Zona - Largura (y)", 0, 80, (0, 80))
+                zone = (*zone_x, *zone_y)
+            # The zone is applied to the charts computed from the whole match too
+            zone_filter = (zone_location, *zone) if zone is not None else None
+            if zone_filter is not None:
+                match_events_df = match_events_df.loc[
+                    get_zone_labels(match_id, zone_filter)
+                ]
+
             # Time filter
             time_filter = st.slider(
                 "Filtrar por Minuto",
                 min_value=0,
-                max_value=get_match_duration(match_events_df),
-                value=(0, get_match_duration(match_events_df)),
+                max_value=get_match_duration(original_match_events_df),
+                value=(0, get_match_duration(original_match_events_df)),
             )
             match_events_df = match_events_df[
                 (match_events_df["minute"] >= time_filter[0])
@@ -782,35 +2811,37 @@ def view_explore():
                         match_events_df["type"] == event_type
                     ]
 
+            # Heatmap options
+            col1, col2 = st.columns(2)
+            with col1:
+                heatmap_event_types = original_match_events_df["type"].dropna().unique()
+                heatmap_event_types.sort()
+                heatmap_event_types = st.multiselect(
+                    "Eventos do Heatmap", list(heatmap_event_types), default=["Carry"]
+                )
+            with col2:
+                heatmap_grids = get_heatmap_grids()
+                heatmap_grid = st.selectbox("Zonas do Heatmap", list(heatmap_grids))
+                heatmap_grid = heatmap_grids[heatmap_grid]
+            show_season_heatmap = st.checkbox("Exibir heatmap da temporada")
+
+            # Above this number of events the maps show the mean flow by zone
+            max_arrows = st.slider(
+                "Máximo de setas nos mapas",
+                min_value=50,
+                max_value=1000,
+                value=200,
+                step=50,
+            )
+
+            # Heatmaps follow the event filter too
+            heatmap_event_types = tuple(
+                sorted(t for t in heatmap_event_types if event_type in ("Todos", t))
+            )
+
         #  --- Metrics
         st.markdown("  ")
-        col1, col2, col3, col4 = st.columns(4)
-        col1.metric(
-            "Chutes",
-            len(match_events_df[match_events_df["type"] == "Shot"]),
-            delta=get_team_metrics_comparison(
-                match_events_df[match_events_df["type"] == "Shot"]
-            ),
-        )
-        col2.metric(
-            "Chutes ao Gol",
-            len(get_shots_on_goal_df(match_events_df)),
-            delta=get_team_metrics_comparison(get_shots_on_goal_df(match_events_df)),
-        )
-        col3.metric(
-            "Passes",
-            len(match_events_df[match_events_df["type"] == "Pass"]),
-            delta=get_team_metrics_comparison(
-                match_events_df[match_events_df["type"] == "Pass"]
-            ),
-        )
-        col4.metric(
-            "Faltas Cometidas",
-            len(match_events_df[match_events_df["type"] == "Foul Committed"]),
-            delta=get_team_metrics_comparison(
-                match_events_df[match_events_df["type"] == "Foul Committed"],
-            ),
-        )
+        display_match_metrics(match_events_df)
         st.markdown("  ")
 
         # ---- Plots
@@ -822,49 +2853,118 @@ def view_explore():
         with col1:
             title = f"Mapa de Passes - {home_team}"
             st.write(f"###### {title}")
-            plot_event_map(match_events_df, home_team, event_type="Pass")
+            plot_event_map(
+                match_events_df, home_team, event_type="Pass", max_arrows=max_arrows
+            )
             progress_bar.progress(10, text=f"Em progresso: {title}...")
         with col2:
             title = f"Mapa de Passes - {alway_team}"
             st.write(f"###### {title}")
-            plot_event_map(match_events_df, alway_team, event_type="Pass")
+            plot_event_map(
+                match_events_df, alway_team, event_type="Pass", max_arrows=max_arrows
+            )
             progress_bar.progress(20, text=f"Em progresso: {title}...")
 
+        # Pass network
+        col1, col2 = st.columns(2)
+        with col1:
+            title = f"Rede de Passes - {home_team}"
+            st.write(f"###### {title}")
+            plot_pass_network(
+                get_pass_network(match_id, home_team, time_filter, zone_filter)
+            )
+            progress_bar.progress(25, text=f"Em progresso: {title}...")
+        with col2:
+            title = f"Rede de Passes - {alway_team}"
+            st.write(f"###### {title}")
+            plot_pass_network(
+                get_pass_network(match_id, alway_team, time_filter, zone_filter)
+            )
+            progress_bar.progress(28, text=f"Em progresso: {title}...")
+
         # Shot map
         col1, col2 = st.columns(2)
         with col1:
             title = f"Mapa de Chutes - {home_team}"
             st.write(f"###### {title}")
             plot_event_map(
-                match_events_df, home_team, event_type="Shot", color="yellow"
+                match_events_df,
+                home_team,
+                event_type="Shot",
+                color="yellow",
+                max_arrows=max_arrows,
             )
             progress_bar.progress(30, text=f"Em progresso: {title}...")
         with col2:
             title = f"Mapa de Chutes - {alway_team}"
             st.write(f"###### {title}")
             plot_event_map(
-                match_events_df, alway_team, event_type="Shot", color="yellow"
+                match_events_df,
+                alway_team,
+                event_type="Shot",
+                color="yellow",
+                max_arrows=max_arrows,
             )
             progress_bar.progress(40, text=f"Em progresso: {title}...")
 
         # Heatmap de Posse de Bola
+        heatmap_name = (
+            "Posse de Bola"
+            if heatmap_event_types == ("Carry",)
+            else ", ".join(heatmap_event_types)
+        )
+        heatmap_player = player if player != "Todos" else ""
         col1, col2 = st.columns(2)
         with col1:
-            title = f"Heatmap Posse de Bola - {home_team}"
+            title = f"Heatmap {heatmap_name} - {home_team}"
             st.write(f"###### {title}")
             plot_events_heatmap(
-                match_events_df, event_type="Carry", team_name=home_team
+                get_heatmap_statistic(
+                    match_id,
+                    home_team,
+                    heatmap_event_types,
+                    heatmap_grid,
+                    time_filter,
+                    heatmap_player,
+                    zone_filter,
+                )
             )
             progress_bar.progress(50, text=f"Em progresso: {title}...")
 
         with col2:
-            title = f"Heatmap Posse de Bola - {alway_team}"
+            title = f"Heatmap {heatmap_name} - {alway_team}"
             st.write(f"###### {title}")
             plot_events_heatmap(
-                match_events_df, event_type="Carry", team_name=alway_team
+                get_heatmap_statistic(
+                    match_id,
+                    alway_team,
+                    heatmap_event_types,
+                    heatmap_grid,
+                    time_filter,
+                    heatmap_player,
+                    zone_filter,
+                )
             )
             progress_bar.progress(60, text=f"Em progresso: {title}...")
 
+        # Season heatmap, built from the cached heatmap of each match
+        if show_season_heatmap:
+            col1, col2 = st.columns(2)
+            for col, team in [(col1, home_team), (col2, alway_team)]:
+                with col:
+                    st.write(f"###### Heatmap {heatmap_name} na Temporada - {team}")
+                    plot_events_heatmap(
+                        get_season_heatmap_statistic(
+                            competition_id,
+                            season_id,
+                            team,
+                            heatmap_event_types,
+                            heatmap_grid,
+                            time_filter,
+                            zone_filter,
+                        )
+                    )
+
         # Shots by player
         col1, col2 = st.columns(2)
         with col1:
@@ -901,7 +3001,27 @@ def view_explore():
 
         # Area graph of passes by player
         plot_area_graph_events_by_team(match_events_df, event_type="Pass")
-        progress_bar.progress(100, text="Em progresso: Passes por Minuto...")
+        progress_bar.progress(97, text="Em progresso: Passes por Minuto...")
+
+        # ---- Build-up
+        st.write("###### Construção de Jogadas")
+        chains = get_possession_chains(match_id, zone_filter)
+        col1, col2 = st.columns(2)
+        for col, team in [(col1, home_team), (col2, alway_team)]:
+            with col:
+                team_chains = filter_possession_chains(chains, team, time_filter)
+                metrics = get_possession_chains_metrics(team_chains)
+                st.write(f"###### {team}")
+                metric_cols = st.columns(4)
+                metric_cols[0].metric("Sequências", metrics["chains"])
+                metric_cols[1].metric("Duração Média", f"{metrics['duration']:.0f}s")
+                metric_cols[2].metric("Terminam em Chute", f"{metrics['shot']:.0%}")
+                metric_cols[3].metric("xG", f"{metrics['xg']:.2f}")
+                plot_possession_chains_zones(team_chains, team)
+        plot_possession_chains_length(
+            filter_possession_chains(chains, minute_range=time_filter)
+        )
+        progress_bar.progress(100, text="Em progresso: Construção de Jogadas...")
 
         progress_bar.empty()
 
@@ -925,6 +3045,77 @@ def view_explore():
             type="primary",
         )
 
+    # -- Profile the memory used by the match events
+    if current_explore_view == "Perfil de Memória":
+        st.write(f"---")
+
+        all_columns = st.toggle("Incluir todas as colunas da partida")
+        if all_columns:
+            match_events_df = get_match_events(match_id)
+        profile = profile_events_df(match_events_df)
+        compacted_df = compact_events_df(match_events_df, profile)
+        memory = profile["memory"].sum()
+        compacted_memory = compacted_df.memory_usage(deep=True, index=False).sum()
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Colunas", len(profile))
+        col2.metric("Memória", format_bytes(memory))
+        col3.metric(
+            "Após Compactação",
+            format_bytes(compacted_memory),
+            delta=f"-{1 - compacted_memory / memory:.0%}" if memory else None,
+            delta_color="inverse",
+        )
+        col4.metric("Colunas Vazias", int((profile["null_ratio"] == 1).sum()))
+
+        # Memory by column
+        st.write("###### Memória por Coluna")
+        st.dataframe(
+            profile.assign(
+                memory=profile["memory"].map(format_bytes),
+                null_ratio=profile["null_ratio"].map("{:.0%}".format),
+            ).rename(
+                columns={
+                    "column": "Coluna",
+                    "dtype": "Tipo",
+                    "memory": "Memória",
+                    "null_ratio": "Nulos",
+                    "cardinality": "Cardinalidade",
+                    "suggestion": "Sugestão",
+                }
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        # Memory held by the caches of every session
+        st.write("###### Memória em Cache (todas as sessões)")
+        show_sessions = is_debug_enabled()
+        cache_memory = get_cache_memory_df(show_sessions)
+        st.caption(f"Total: {format_bytes(cache_memory['memory'].sum())}")
+        if show_sessions:
+            st.caption(
+                "Modo debug: sessões numeradas na ordem reportada pelo Streamlit, "
+                "sem identificar o usuário."
+            )
+        else:
+            st.caption(
+                "O estado das sessões é somado. Defina STATSBOMB_DEBUG=1 para ver "
+                "cada sessão."
+            )
+        st.dataframe(
+            cache_memory.assign(memory=cache_memory["memory"].map(format_bytes)).rename(
+                columns={
+                    "category": "Categoria",
+                    "cache": "Cache",
+                    "entries": "Entradas",
+                    "memory": "Memória",
+                }
+            ),
+            hide_index=True,
+            use_container_width=True,
+        )
+
     # -- Explore the raw DataFrame
     if current_explore_view == "Explorar DataFrame":
 
@@ -932,12 +3123,13 @@ def view_explore():
         st.write(f"---")
 
         # Make a multiselect for selecting the columns to display
+        # Columns that are not loaded yet are fetched from the events store
         columns = st.multiselect(
             "Filtrar Colunas",
-            match_events_df.columns.tolist(),
+            get_match_event_columns(match_id),
             default=match_events_df.columns.tolist(),
         )
-        df = match_events_df[columns]
+        df = get_match_events(match_id, tuple(columns))
 
         # Allow user to filter the displayed data with a search_filter box
         search_filter = st.text_input("Filtrar Valores", "")
@@ -967,6 +3159,273 @@ def view_explore():
         )
 
 
+### MATCHES COMPARISON ###
+def view_compare():
+    st.title("📊 Comparar")
+    st.write("Selecione várias partidas de um time para comparar.")
+
+    # Show competitions selector
+    competition_id, season_id = competitions_selector()
+
+    # Show multiple matches selector
+    team, match_ids = multi_matches_selector(competition_id, season_id)
+    if not match_ids:
+        st.info("Nenhuma partida selecionada.")
+        return
+
+    # Get the data of every match at once
+    with st.spinner(f"Carregando {len(match_ids)} partidas..."):
+        events_df = get_multi_match_events(
+            match_ids, get_view_event_columns("Comparar Partidas")
+        )
+    matches = get_competition_matches(competition_id, season_id)
+
+    display_mode = st.radio(
+        "Modo de Exibição", ["Lado a lado", "Agregado"], horizontal=True
+    )
+    st.write(f"---")
+
+    # -- Aggregate the matches
+    if display_mode == "Agregado":
+        st.write(f"##### {team} - {len(match_ids)} partidas")
+        display_match_metrics(events_df, team)
+        st.markdown("  ")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write(f"###### Heatmap Posse de Bola - {team}")
+            plot_events_heatmap(get_matches_heatmap_statistic(match_ids, team))
+        with col2:
+            plot_bar_chart_events_by_player(
+                events_df,
+                team,
+                event_type="Shot",
+                event_name="Chutes",
+                orientation="v",
+            )
+        plot_bar_chart_events_by_player(events_df, team, event_type="Pass")
+
+    # -- Show the matches side by side
+    if display_mode == "Lado a lado":
+        for i in range(0, len(match_ids), 2):
+            cols = st.columns(2)
+            for col, match_id in zip(cols, match_ids[i : i + 2]):
+                with col:
+                    match_events_df = events_df[events_df["match_id"] == match_id]
+                    st.write(f"##### {generate_match_name(matches, match_id)}")
+                    display_match_metrics(match_events_df)
+                    st.write(f"###### Heatmap Posse de Bola - {team}")
+                    plot_events_heatmap(get_heatmap_statistic(match_id, team))
+                    plot_bar_chart_events_by_player(
+                        match_events_df,
+                        team,
+                        event_type="Shot",
+                        event_name="Chutes",
+                        orientation="v",
+                    )
+                    plot_bar_chart_events_by_player(
+                        match_events_df, team, event_type="Pass"
+                    )
+
+
+### PLAYERS ###
+def view_players():
+    st.title("👤 Jogadores")
+    st.write("Selecione um jogador para ver suas partidas e totais por temporada.")
+
+    # Show competitions selector, matches are indexed as soon as they are stored
+    competition_id, season_id = competitions_selector()
+    if st.button("Indexar todas as partidas da temporada"):
+        matches = get_competition_matches(competition_id, season_id)
+        with st.spinner(f"Carregando {len(matches)} partidas..."):
+            store_matches_events([int(match_id) for match_id in matches["match_id"]])
+    players = get_players_directory()
+
+    if not players:
+        st.info("Nenhuma partida indexada. Carregue partidas para ver os jogadores.")
+        return
+
+    # Show players selector
+    player_ids = sorted(players, key=lambda player_id: players[player_id])
+    player_id = get_state("player_id")
+    idx = player_ids.index(player_id) if player_id in player_ids else 0
+    player_id = st.selectbox(
+        "Selecione um jogador",
+        player_ids,
+        index=idx,
+        format_func=lambda player_id: players[player_id],
+    )
+    set_state("player_id", player_id)
+    player_matches = get_player_matches_df(player_id)
+    event_columns = [
+        column
+        for column in ["Pass", "Shot", "Carry", "Dribble", "Duel", "Foul Committed"]
+        if column in player_matches.columns
+    ]
+
+    # ---- Season totals
+    st.write(f"---")
+    st.write("###### Totais por Temporada")
+    totals = (
+        player_matches.groupby(["Competição", "Temporada"])
+        .agg(
+            Partidas=("match_id", "count"),
+            Minutos=("Minutos", "sum"),
+            **{column: (column, "sum") for column in event_columns},
+        )
+        .reset_index()
+    )
+    st.dataframe(totals, hide_index=True, use_container_width=True)
+
+    # ---- Matches
+    st.write("###### Partidas")
+    st.dataframe(
+        player_matches[
+            ["Data", "Competição", "Temporada", "Partida", "Time", "Minutos"]
+            + event_columns
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    # Open a match in the explore view
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        match_id = st.selectbox(
+            "Abrir partida",
+            player_matches["match_id"].tolist(),
+            format_func=lambda match_id: " - ".join(
+                player_matches[player_matches["match_id"] == match_id][
+                    ["Data", "Partida"]
+                ].values[0]
+            ),
+        )
+    with col2:
+        st.write("  ")
+        if st.button("🔍 Explorar", use_container_width=True):
+            match = player_matches[player_matches["match_id"] == match_id].iloc[0]
+            open_match(int(match["competition_id"]), int(match["season_id"]), match_id)
+
+
+### SEARCH ###
+def view_search():
+    st.title("🔎 Buscar")
+    st.write("Busque eventos em todas as partidas já carregadas.")
+
+    # Show competitions selector, matches are indexed as soon as they are stored
+    competition_id, season_id = competitions_selector()
+    if st.button("Indexar todas as partidas da temporada"):
+        matches = get_competition_matches(competition_id, season_id)
+        with st.spinner(f"Carregando {len(matches)} partidas..."):
+            store_matches_events([int(match_id) for match_id in matches["match_id"]])
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query = st.text_input(
+            "Buscar eventos", "", placeholder="Ex.: Penalty Saved, Red Card, Messi Goal"
+        )
+    with col2:
+        scope = st.selectbox("Buscar em", ["Temporada selecionada", "Todas"])
+    if not query:
+        return
+
+    # Search the index, one page at a time, each page starts after the last hit
+    # of the previous one
+    page_size = 50
+    max_count = 1000
+    page = get_state("search_page")
+    cursors = get_state("search_cursors")
+    season = (competition_id, season_id) if scope != "Todas" else ()
+    if get_state("search_query") != (query, *season) or page >= len(cursors):
+        page, cursors = 0, [0]
+    set_state("search_query", (query, *season))
+    started = time.perf_counter()
+    total, hits = search_events(
+        query,
+        *season,
+        after=cursors[page],
+        page_size=page_size,
+        max_count=max_count,
+    )
+    elapsed = (time.perf_counter() - started) * 1000
+    total_text = f"{total}+" if total >= max_count else f"{total}"
+    st.caption(f"{total_text} eventos encontrados em {elapsed:.0f} ms")
+    if not total:
+        return
+
+    # Show the hits
+    hits["Partida"] = hits["home_team"] + " x " + hits["away_team"]
+    st.dataframe(
+        hits.rename(
+            columns={
+                "match_date": "Data",
+                "minute": "Minuto",
+                "player": "Jogador",
+                "team": "Time",
+                "type": "Evento",
+                "outcome": "Resultado",
+                "attributes": "Atributos",
+            }
+        )[
+            [
+                "Data",
+                "Partida",
+                "Minuto",
+                "Jogador",
+                "Time",
+                "Evento",
+                "Resultado",
+                "Atributos",
+                "match_id",
+                "event_id",
+            ]
+        ],
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    # Paging
+    n_pages = (total - 1) // page_size + 1
+    n_pages_text = f"{n_pages}+" if total >= max_count else f"{n_pages}"
+    has_next = len(hits) == page_size and (
+        total >= max_count or page < n_pages - 1
+    )
+    col1, col2, col3 = st.columns([1, 2, 1])
+    if col1.button("⬅️ Anterior", disabled=page == 0, use_container_width=True):
+        set_state("search_page", page - 1)
+        st.rerun()
+    col2.markdown(
+        f"<p style='text-align: center;'>Página {page + 1} de {n_pages_text}</p>",
+        unsafe_allow_html=True,
+    )
+    if col3.button("Próxima ➡️", disabled=not has_next, use_container_width=True):
+        set_state("search_cursors", cursors[: page + 1] + [int(hits["rowid"].iloc[-1])])
+        set_state("search_page", page + 1)
+        st.rerun()
+    set_state("search_page", page)
+    set_state("search_cursors", cursors)
+
+    # Open a hit in the explore view
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        hit = st.selectbox(
+            "Abrir partida",
+            hits.index.tolist(),
+            format_func=lambda i: (
+                f"{hits.at[i, 'Partida']} - {hits.at[i, 'minute']}' "
+                f"{hits.at[i, 'player']} ({hits.at[i, 'type']})"
+            ),
+        )
+    with col2:
+        st.write("  ")
+        if st.button("🔍 Explorar", use_container_width=True):
+            open_match(
+                hits.at[hit, "competition_id"],
+                hits.at[hit, "season_id"],
+                hits.at[hit, "match_id"],
+            )
+
+
 ### ABOUT ###
 def view_about():
     st.title("✨ Sobre")
@@ -1026,15 +3485,26 @@ def get_sidebar(view_index=0):
     current_view = st.sidebar.radio("Menu", get_available_views(), index=view_index)
     set_state("current_view", current_view)
 
+    # Prefetch hit rate
+    hit_rate_text = get_prefetch_hit_rate_text()
+    if hit_rate_text:
+        st.sidebar.caption(hit_rate_text)
+
 
 def Dashboard():
     # Display the sidebar
-    get_sidebar()
+    get_sidebar(get_available_views().index(get_current_view()))
 
     # Display the selected view
     current_view = get_current_view()
     if current_view == "🔍 Explorar":
         view_explore()
+    elif current_view == "📊 Comparar":
+        view_compare()
+    elif current_view == "👤 Jogadores":
+        view_players()
+    elif current_view == "🔎 Buscar":
+        view_search()
     elif current_view == "✨ Sobre":
         view_about()
 
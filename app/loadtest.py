@@ -0,0 +1,302 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsbombpy import sb
+from streamlit.testing.v1 import AppTest
+
+# --------------------------
+# CONFIGURATIONS
+# --------------------------
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+DEFAULT_FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "fixtures"
+)
+
+# Warnings the dashboard shows in normal use, e.g. a heatmap with no events
+EXPECTED_WARNINGS = ("Dados inválidos",)
+
+REPORT_NOTE = (
+    "Each session runs in its own process, with its own Streamlit runtime, caches "
+    "and executors. The numbers describe independent single-user apps, not one "
+    "server: do not use the throughput or RSS to size a worker."
+)
+
+# --------------------------
+# FIXTURE BACKEND
+# --------------------------
+
+
+def record_fixtures(fixtures_dir, competition_id, season_id, n_matches):
+    # Save a small slice of the StatsBomb data, so the load test runs offline
+    os.makedirs(os.path.join(fixtures_dir, "events"), exist_ok=True)
+    os.makedirs(os.path.join(fixtures_dir, "lineups"), exist_ok=True)
+
+    competitions = sb.competitions()
+    competitions = competitions[
+        (competitions["competition_id"] == competition_id)
+        & (competitions["season_id"] == season_id)
+    ]
+    competitions.to_pickle(os.path.join(fixtures_dir, "competitions.pkl"))
+
+    matches = sb.matches(competition_id=competition_id, season_id=season_id)
+    matches = matches.sort_values("match_date").head(n_matches)
+    matches.to_pickle(os.path.join(fixtures_dir, "matches.pkl"))
+
+    for match_id in matches["match_id"]:
+        print(f"Recording match {match_id}...")
+        events = sb.events(match_id=int(match_id))
+        events.to_pickle(os.path.join(fixtures_dir, "events", f"{match_id}.pkl"))
+        lineups = sb.lineups(match_id=int(match_id))
+        pd.to_pickle(lineups, os.path.join(fixtures_dir, "lineups", f"{match_id}.pkl"))
+
+
+def use_fixtures(fixtures_dir, latency=0.0):
+    # The app imports the same statsbombpy module, so it reads the fixtures too
+    def competitions(**kwargs):
+        time.sleep(latency)
+        return pd.read_pickle(os.path.join(fixtures_dir, "competitions.pkl"))
+
+    def matches(competition_id, season_id, **kwargs):
+        time.sleep(latency)
+        return pd.read_pickle(os.path.join(fixtures_dir, "matches.pkl"))
+
+    def events(match_id, **kwargs):
+        time.sleep(latency)
+        return pd.read_pickle(os.path.join(fixtures_dir, "events", f"{match_id}.pkl"))
+
+    def lineups(match_id, **kwargs):
+        time.sleep(latency)
+        return pd.read_pickle(os.path.join(fixtures_dir, "lineups", f"{match_id}.pkl"))
+
+    sb.competitions = competitions
+    sb.matches = matches
+    sb.events = events
+    sb.lineups = lineups
+
+
+# --------------------------
+# SESSION FLOWS
+# --------------------------
+
+
+def get_widget(widgets, label):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    return None
+
+
+def pick(widget, rng):
+    if widget is not None and len(widget.options) > 0:
+        widget.set_value(rng.choice(widget.options))
+    return widget
+
+
+def run_session(session_id, n_actions, timeout, fixtures_dir, latency):
+    # Runs in its own process: AppTest swaps the global Streamlit runtime on
+    # every run, so sessions sharing a process break each other's renders
+    use_fixtures(fixtures_dir, latency)
+    rng = random.Random(session_id)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    latencies, errors = [], []
+
+    def timed(name, action=None):
+        # Each action triggers a full rerun of the script
+        started = time.perf_counter()
+        try:
+            if action is not None:
+                action()
+            at.run()
+            if at.exception:
+                errors.append((session_id, name, str(at.exception[0].message)))
+            # The plots catch their own errors and show a warning instead
+            for warning in at.warning:
+                if not any(text in warning.value for text in EXPECTED_WARNINGS):
+                    errors.append((session_id, name, str(warning.value)))
+        except Exception as e:
+            errors.append((session_id, name, str(e)))
+        latencies.append((name, time.perf_counter() - started))
+
+    # Open the dashboard
+    timed("open")
+
+    def select(label):
+        return lambda: pick(get_widget(at.selectbox, label), rng)
+
+    # Pick a competition, season and match
+    timed("competition", select("Selecione uma competição"))
+    timed("season", select("Selecione uma temporada"))
+    timed("match", select("Selecione uma partida"))
+
+    for _ in range(n_actions):
+        action = rng.choice(["minute", "player", "event", "match", "search"])
+
+        # Drag the minute slider
+        if action == "minute":
+            slider = get_widget(at.slider, "Filtrar por Minuto")
+            if slider is not None:
+                start = rng.randint(slider.min, slider.max)
+                end = rng.randint(start, slider.max)
+                timed(action, lambda: slider.set_range(start, end))
+
+        # Switch player or event type
+        elif action == "player":
+            timed(action, select("Filtrar por Jogador"))
+        elif action == "event":
+            timed(action, select("Filtrar por Evento"))
+
+        # Switch match
+        elif action == "match":
+            timed(action, select("Selecione uma partida"))
+
+        # Search the raw DataFrame, then go back to the analysis
+        elif action == "search":
+            view = get_widget(at.selectbox, "Opções de Visualização")
+            timed("explore", lambda: view.set_value("Explorar DataFrame"))
+            search = get_widget(at.text_input, "Filtrar Valores")
+            if search is not None:
+                term = rng.choice(["Pass", "Shot", "Carry", "Goal", "Foul"])
+                timed(action, lambda: search.input(term))
+            view = get_widget(at.selectbox, "Opções de Visualização")
+            timed("analysis", lambda: view.set_value("Análise da Partida"))
+
+    return latencies, errors, get_peak_rss_mb()
+
+
+# --------------------------
+# REPORT
+# --------------------------
+
+
+def get_peak_rss_mb():
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def build_report(latencies, errors, elapsed, n_sessions, peak_rss):
+    durations = pd.DataFrame(latencies, columns=["action", "seconds"])
+
+    def percentiles(seconds):
+        p50, p90, p99 = np.percentile(seconds, [50, 90, 99])
+        return {
+            "reruns": len(seconds),
+            "p50_ms": round(p50 * 1000, 1),
+            "p90_ms": round(p90 * 1000, 1),
+            "p99_ms": round(p99 * 1000, 1),
+            "max_ms": round(seconds.max() * 1000, 1),
+        }
+
+    return {
+        "note": REPORT_NOTE,
+        "sessions": n_sessions,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_reruns_s": round(len(durations) / elapsed, 2),
+        "peak_rss_mb": round(max(peak_rss.values(), default=0), 1),
+        "peak_rss_mb_per_session": {
+            session_id: round(rss, 1) for session_id, rss in sorted(peak_rss.items())
+        },
+        "errors": len(errors),
+        "overall": percentiles(durations["seconds"]),
+        "actions": {
+            action: percentiles(group["seconds"])
+            for action, group in durations.groupby("action")
+        },
+    }
+
+
+def print_report(report, errors):
+    print(f"\n{report['note']}")
+    print(f"\nSessões: {report['sessions']}")
+    print(f"Tempo total: {report['elapsed_s']}s")
+    print(f"Throughput: {report['throughput_reruns_s']} reruns/s")
+    print(f"Pico de RSS (maior sessão): {report['peak_rss_mb']} MB")
+    for session_id, rss in report["peak_rss_mb_per_session"].items():
+        print(f"  sessão {session_id}: {rss} MB")
+    print(f"Erros: {report['errors']}\n")
+
+    rows = {"TOTAL": report["overall"], **report["actions"]}
+    print(pd.DataFrame(rows).T.to_string())
+
+    for session_id, action, message in errors[:10]:
+        print(f"[sessão {session_id}] {action}: {message}")
+
+
+# --------------------------
+# CLI
+# --------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the dashboard.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="Record the fixture data.")
+    record.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    record.add_argument("--competition", type=int, default=43)
+    record.add_argument("--season", type=int, default=106)
+    record.add_argument("--matches", type=int, default=5)
+
+    run = subparsers.add_parser("run", help="Simulate concurrent sessions.")
+    run.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    run.add_argument("--sessions", type=int, default=10)
+    run.add_argument("--actions", type=int, default=20)
+    run.add_argument("--timeout", type=float, default=120)
+    run.add_argument("--latency", type=float, default=0.0, help="Latency (s).")
+    run.add_argument("--warm", action="store_true", help="Reuse the app cache.")
+    run.add_argument("--json", help="Save the report to a JSON file.")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record_fixtures(args.fixtures, args.competition, args.season, args.matches)
+        return
+
+    # Start with an empty cache unless asked otherwise
+    if not args.warm:
+        os.environ["STATSBOMB_CACHE_DIR"] = tempfile.mkdtemp(prefix="loadtest-")
+
+    # One process per session, the children inherit the cache dir env var
+    latencies, errors, peak_rss = [], [], {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.sessions) as executor:
+        futures = {
+            executor.submit(
+                run_session,
+                session_id,
+                args.actions,
+                args.timeout,
+                args.fixtures,
+                args.latency,
+            ): session_id
+            for session_id in range(args.sessions)
+        }
+    for future, session_id in futures.items():
+        if future.exception():
+            errors.append((session_id, "session", str(future.exception())))
+            continue
+        session_latencies, session_errors, session_rss = future.result()
+        latencies.extend(session_latencies)
+        errors.extend(session_errors)
+        peak_rss[session_id] = session_rss
+    elapsed = time.perf_counter() - started
+
+    report = build_report(latencies, errors, elapsed, args.sessions, peak_rss)
+    print_report(report, errors)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
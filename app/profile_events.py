@@ -0,0 +1,71 @@
+import os
+import sys
+import argparse
+
+import pandas as pd
+
+# Reuse the dashboard data layer, Streamlit runs in bare mode outside `streamlit run`
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import app
+
+# --------------------------
+# REPORT
+# --------------------------
+
+
+def print_match_profile(match_id, events, apply):
+    profile = app.profile_events_df(events)
+    memory = profile["memory"].sum()
+    compacted = app.compact_events_df(events, profile)
+    compacted_memory = compacted.memory_usage(deep=True, index=False).sum()
+
+    print(f"\n=== Partida {match_id}: {len(events)} eventos, {len(profile)} colunas")
+    print(f"Memória: {app.format_bytes(memory)}")
+    print(
+        f"Após compactação: {app.format_bytes(compacted_memory)} "
+        f"(-{1 - compacted_memory / memory:.0%})"
+    )
+    print(
+        profile.assign(
+            memory=profile["memory"].map(app.format_bytes),
+            null_ratio=profile["null_ratio"].map("{:.0%}".format),
+        ).to_string(index=False)
+    )
+    return compacted if apply else events
+
+
+# --------------------------
+# CLI
+# --------------------------
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory profile of match events.")
+    parser.add_argument("match_ids", type=int, nargs="+")
+    parser.add_argument(
+        "--analysis-columns",
+        action="store_true",
+        help="Only the columns held by the dashboard engines.",
+    )
+    parser.add_argument(
+        "--apply", action="store_true", help="Apply the suggested compaction."
+    )
+    parser.add_argument("--output", help="Directory to save the (compacted) events.")
+    args = parser.parse_args()
+
+    columns = app.get_view_event_columns() if args.analysis_columns else None
+    total_memory = 0
+    for match_id in args.match_ids:
+        events = app.get_match_events(match_id, columns)
+        events = print_match_profile(match_id, events, args.apply)
+        total_memory += events.memory_usage(deep=True, index=False).sum()
+
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+            pd.to_pickle(events, os.path.join(args.output, f"{match_id}.pkl"))
+
+    print(f"\nTotal ({len(args.match_ids)} partidas): {app.format_bytes(total_memory)}")
+
+
+if __name__ == "__main__":
+    main()